@@ -0,0 +1,760 @@
+"""
+Vulnerability analysis runner for NFT contracts.
+
+    python analyze.py --tool {mythril,slither,both} --mode {all,sample,prioritized}
+
+Sources are fetched once into the shared cache, then every selected tool runs
+over the same contracts in one process pool. run_mythril_analysis.py,
+run_mythril_sample.py, run_mythril_prioritized.py and run_slither_analysis.py
+are thin wrappers around this module.
+"""
+
+import argparse
+import asyncio
+import heapq
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from etherscan_client import EtherscanClient
+from contract_sources import (
+    SOURCES_DIR, checksum, ensure_source_on_disk, fetch_all,
+    group_identical_sources, pick_main_file, with_duplicates,
+)
+from json_io import dump_json, load_config, loads, write_jsonl
+
+try:
+    from mythril_analyzer import MythrilAnalyzer
+except ImportError:
+    MythrilAnalyzer = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from tqdm import tqdm
+    from tqdm.contrib.logging import logging_redirect_tqdm
+except ImportError:
+    tqdm = None
+
+logger = logging.getLogger(__name__)
+
+TOOLS = ("mythril", "slither")
+IMPACT_LEVELS = ('High', 'Medium', 'Low', 'Informational', 'Optimization')
+MODES = ("all", "sample", "prioritized")
+SAMPLE_SIZE = 15
+PRIORITY_THRESHOLD = 0.95
+# Per-contract Mythril timeout (seconds); the full run gets a little longer
+MYTHRIL_TIMEOUT = {"all": 90, "sample": 60, "prioritized": 60}
+
+
+def read_addresses(path: str = "contracts.txt") -> List[str]:
+    """Read contract addresses, one per line, ignoring blanks and # comments."""
+    with open(path) as f:
+        return [
+            line.strip()
+            for line in f
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+
+def iter_similarity_pairs(path: str = 'similarity_report.json') -> Iterator[Tuple[str, dict]]:
+    """
+    Stream (pair_key, pair_data) entries from the similarity report without
+    loading the whole file into memory.
+    """
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.kvitems(f, '', use_float=True)
+        else:
+            yield from loads(f.read()).items()
+
+
+def get_high_risk_contracts(similarity_pairs: Iterable[Tuple[str, dict]], threshold: float = 0.95,
+                            top_k: Optional[int] = None
+                            ) -> Tuple[List[str], Dict[str, List[Tuple[str, float]]]]:
+    """
+    Extract contracts involved in high-similarity pairs.
+
+    Args:
+        similarity_pairs: (pair_key, pair_data) items, e.g. from iter_similarity_pairs()
+        threshold: Minimum similarity (0-1 range, e.g., 0.95 = 95%)
+        top_k: Only return the top_k riskiest contracts (None = all)
+
+    Returns:
+        (addresses, adjacency) - unique contract addresses sorted by risk, and
+        {address: [(other_address, full_similarity), ...]} for the high-risk pairs
+    """
+    # Track contracts and their risk scores
+    contract_risk = {}  # {address: risk_score}
+    current_risk = contract_risk.get
+    adjacency = {}  # {address: [(other, full_sim)]}
+
+    # Single pass over all pair comparisons
+    for _, pair_data in similarity_pairs:
+        if not isinstance(pair_data, dict):
+            continue
+
+        # Risk score = max similarity; high risk if it reaches the threshold
+        risk_score = max(pair_data.get('full_similarity', 0), pair_data.get('partial_similarity', 0))
+        if risk_score < threshold:
+            continue
+
+        # Update risk scores (keep highest)
+        addr1, addr2 = pair_data.get('contract1'), pair_data.get('contract2')
+        for addr in (addr1, addr2):
+            if addr and risk_score > current_risk(addr, 0):
+                contract_risk[addr] = risk_score
+
+        # Remember the edge both ways for the clone cluster analysis
+        if addr1 and addr2:
+            full_sim = pair_data.get('full_similarity', 0)
+            adjacency.setdefault(addr1, []).append((addr2, full_sim))
+            adjacency.setdefault(addr2, []).append((addr1, full_sim))
+
+    # Sort by risk score (highest first); a bounded heap when only the top is needed
+    if top_k is None:
+        sorted_contracts = sorted(contract_risk.items(), key=lambda x: x[1], reverse=True)
+    else:
+        sorted_contracts = heapq.nlargest(top_k, contract_risk.items(), key=lambda x: x[1])
+
+    return [addr for addr, score in sorted_contracts], adjacency
+
+
+def select_addresses(mode: str, limit: Optional[int] = None
+                     ) -> Tuple[List[str], Dict[str, List[Tuple[str, float]]]]:
+    """
+    Pick the contracts to analyze for a mode.
+
+    Returns:
+        (addresses, adjacency) - adjacency is only filled in prioritized mode
+    """
+    adjacency = {}
+    if mode == "prioritized":
+        print("Loading similarity analysis results...")
+        if not os.path.exists('similarity_report.json'):
+            raise FileNotFoundError("similarity_report.json not found - run the similarity analysis first")
+        # Only --limit caps the contracts; heap-select just that many when it is given
+        addresses, adjacency = get_high_risk_contracts(iter_similarity_pairs(), threshold=PRIORITY_THRESHOLD,
+                                                       top_k=limit)
+        if not addresses:
+            print(f"No high-risk clone pairs found (>= {PRIORITY_THRESHOLD:.0%} similarity).")
+            print("Running analysis on all contracts instead...")
+            addresses = read_addresses()
+    else:
+        addresses = read_addresses()
+        if mode == "sample" and limit is None:
+            limit = SAMPLE_SIZE
+
+    if limit is not None:
+        addresses = addresses[:limit]
+    return addresses, adjacency
+
+
+def _slither_result(address: str, detectors: List[Dict]) -> Dict:
+    """Build the success result for a contract from its Slither detectors."""
+    # Count by impact
+    counts = Counter(detector.get('impact', 'Informational') for detector in detectors)
+    impact_counts = {impact: counts[impact] for impact in IMPACT_LEVELS}
+
+    return {
+        'success': True,
+        'address': address,
+        'issues': detectors,
+        'issue_count': len(detectors),
+        'impact_breakdown': impact_counts,
+        'error': None
+    }
+
+
+def analyze_with_slither(contract_file: str, address: str) -> Dict:
+    """
+    Analyze a Solidity contract with Slither.
+
+    Args:
+        contract_file: Path to .sol file
+        address: Contract address for reference
+
+    Returns:
+        Analysis results dictionary
+    """
+    try:
+        # Run Slither with JSON output
+        cmd = ['slither', contract_file, '--json', '-', '--solc-disable-warnings']
+
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+
+        # Slither outputs JSON to stdout, but may also have stderr messages
+        output = result.stdout.strip()
+
+        # If no stdout but stderr exists, check if it's JSON error
+        if not output and result.stderr:
+            # Try to parse stderr as JSON (some errors come this way)
+            try:
+                data = loads(result.stderr)
+                if isinstance(data, dict) and 'success' in data:
+                    output = result.stderr
+            except:
+                pass
+
+        # Parse JSON output
+        if output:
+            try:
+                data = loads(output)
+
+                if data.get('success'):
+                    detectors = data.get('results', {}).get('detectors', [])
+                    return _slither_result(address, detectors)
+                else:
+                    # Slither failed
+                    error_msg = data.get('error', 'Unknown Slither error')
+                    return {
+                        'success': False,
+                        'address': address,
+                        'error': error_msg,
+                        'issues': [],
+                        'issue_count': 0
+                    }
+            except ValueError as e:
+                return {
+                    'success': False,
+                    'address': address,
+                    'error': f'JSON parse error: {str(e)}',
+                    'issues': [],
+                    'issue_count': 0
+                }
+        else:
+            # No output at all
+            error_msg = result.stderr[:500] if result.stderr else 'No output from Slither'
+            return {
+                'success': False,
+                'address': address,
+                'error': error_msg,
+                'issues': [],
+                'issue_count': 0
+            }
+
+    except subprocess.TimeoutExpired:
+        return {
+            'success': False,
+            'address': address,
+            'error': 'Analysis timed out after 30 seconds',
+            'issues': [],
+            'issue_count': 0
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'address': address,
+            'error': str(e),
+            'issues': [],
+            'issue_count': 0
+        }
+
+
+def precompile_with_crytic(contract_file: Path) -> Optional[Path]:
+    """
+    Compile contract_file with crytic-compile and keep the standard export
+    next to it, so Slither loads the compiled AST instead of invoking solc.
+    The artifact is reused by later runs while it is newer than the source;
+    on a cold run this only moves the solc work here, plus a process start,
+    so it pays off on reruns. Mythril cannot load it and compiles separately.
+
+    Returns:
+        Path to the <name>_export.json artifact, or None if compilation failed
+    """
+    # Slither only recognises crytic-compile exports by the _export.json suffix
+    artifact = contract_file.with_name(f"{contract_file.stem}_export.json")
+    try:
+        if artifact.stat().st_mtime >= contract_file.stat().st_mtime:
+            return artifact
+    except OSError:
+        pass
+
+    export_dir = tempfile.mkdtemp(prefix="crytic_", dir=contract_file.parent)
+    try:
+        cmd = ['crytic-compile', str(contract_file),
+               '--export-format', 'standard', '--export-dir', export_dir]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        exported = os.path.join(export_dir, f"{contract_file.name}.json")
+        if result.returncode != 0 or not os.path.exists(exported):
+            return None
+        os.replace(exported, artifact)
+        return artifact
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+
+def analyze_batch_with_slither(contract_files: Dict[str, str]) -> Optional[Dict[str, Dict]]:
+    """
+    Analyze many contracts with a single Slither invocation, paying Slither's
+    startup cost once instead of per contract.
+
+    Args:
+        contract_files: {address: path to .sol file}
+
+    Returns:
+        {address: analysis result}, or None if the batch as a whole failed
+        (typically contracts that need different solc versions) so the
+        caller can fall back to one run per contract
+    """
+    batch_dir = tempfile.mkdtemp(prefix="slither_batch_")
+    try:
+        # One file per address so findings can be attributed back by filename
+        owners = {}
+        for address, contract_file in contract_files.items():
+            target = os.path.join(batch_dir, f"{address}.sol")
+            try:
+                os.link(contract_file, target)
+            except OSError:
+                shutil.copyfile(contract_file, target)
+            owners[os.path.realpath(target)] = address
+
+        print(f"  Running Slither on {len(owners)} contracts in one batch...")
+        cmd = ['slither', batch_dir, '--json', '-', '--solc-disable-warnings']
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=30 * len(owners)
+        )
+
+        try:
+            data = loads(result.stdout)
+        except ValueError:
+            return None
+        if not data.get('success'):
+            return None
+
+        per_address = {address: [] for address in contract_files}
+        for detector in data.get('results', {}).get('detectors', []):
+            elements = detector.get('elements') or [{}]
+            filename = elements[0].get('source_mapping', {}).get('filename_absolute')
+            address = owners.get(os.path.realpath(filename)) if filename else None
+            if address:
+                per_address[address].append(detector)
+
+        return {
+            address: _slither_result(address, detectors)
+            for address, detectors in per_address.items()
+        }
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+
+def _skipped(address: str) -> Dict:
+    return {
+        "address": address,
+        "status": "skipped",
+        "reason": "Source code not available"
+    }
+
+
+def _prepare_source(addr: str, api_key: str) -> Tuple[str, str, Optional[Path]]:
+    """
+    Materialize a contract's main source file in the shared source cache.
+    Returns (checksum address, contract name, path or None if unavailable).
+    """
+    checksum_addr = checksum(addr)
+
+    # Served from the local cache after fetch_phase
+    contract_data = EtherscanClient(api_key).get_contract_source(checksum_addr)
+    if not contract_data:
+        return checksum_addr, "", None
+
+    # Multi-file sources are analyzed through their main file
+    main_file, contract_code = pick_main_file(contract_data)
+    contract_name = Path(main_file).stem if main_file else f"Contract_{checksum_addr[:8]}"
+
+    # Skipped if an earlier run already wrote it
+    return checksum_addr, contract_name, ensure_source_on_disk(checksum_addr, contract_name, contract_code)
+
+
+def _analyze_one(tool: str, addr: str, api_key: str, timeout: int, precompile: bool = False) -> Dict:
+    """
+    Prepare and analyze a single contract with one tool.
+    Top-level so it can be pickled and run in a worker process.
+    """
+    checksum_addr, contract_name, temp_file = _prepare_source(addr, api_key)
+    if temp_file is None:
+        return _skipped(checksum_addr)
+
+    if tool == "slither":
+        # Fall back to compiling the source if the precompile step failed
+        artifact = precompile_with_crytic(temp_file) if precompile else None
+        return analyze_with_slither(str(artifact or temp_file), checksum_addr)
+
+    result = MythrilAnalyzer(timeout=timeout).analyze_source(str(temp_file), contract_name, timeout=timeout)
+    result['address'] = checksum_addr
+    return result
+
+
+def fetch_phase(addresses: List[str], api_key: str) -> Dict[str, Optional[str]]:
+    """
+    Fetch every source once, concurrently, into the shared cache.
+    Addresses found unverified within the last day are skipped without a request.
+
+    Returns:
+        {checksum address: source or None}
+    """
+    print(f"Fetching {len(addresses)} contract sources...")
+    return asyncio.run(fetch_all(EtherscanClient(api_key), [checksum(a) for a in addresses]))
+
+
+def analyze_phase(addresses: List[str], sources: Dict[str, Optional[str]], tools: Iterable[str],
+                  api_key: str, timeout: int = 60, batch: bool = False,
+                  precompile: bool = False) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield (tool, result) as contracts finish analysis.
+
+    All tools share one process pool, so Mythril and Slither run side by side.
+    Contracts without source are skipped and byte-identical sources are
+    analyzed once. With batch=True Slither runs once over all sources,
+    falling back to per-contract runs if the batch fails. With
+    precompile=True Slither runs on cached crytic-compile artifacts, which
+    saves solc work on warm reruns only (see precompile_with_crytic).
+    """
+    tools = tuple(tools)
+    for addr in addresses:
+        if sources.get(checksum(addr)) is None:
+            for tool in tools:
+                yield tool, _skipped(checksum(addr))
+
+    # Byte-identical sources (clones) are analyzed once and the result reused
+    groups = group_identical_sources([sources.get(checksum(a)) for a in addresses])
+    if not groups:
+        return
+
+    workers = max(1, min(len(groups) * len(tools), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_analyze_one, tool, addresses[idx], api_key, timeout, precompile): (tool, idx)
+            for tool in tools
+            if not (batch and tool == "slither")
+            for idx in groups
+        }
+
+        if batch and "slither" in tools:
+            prepared = {idx: _prepare_source(addresses[idx], api_key) for idx in groups}
+            batch_results = analyze_batch_with_slither({
+                checksum_addr: str(path)
+                for checksum_addr, _, path in prepared.values() if path is not None
+            })
+            if batch_results is not None:
+                for idx, (checksum_addr, _, path) in prepared.items():
+                    result = batch_results[checksum_addr] if path is not None else _skipped(checksum_addr)
+                    for _, dup_result in with_duplicates(idx, result, groups, addresses):
+                        yield "slither", dup_result
+            else:
+                print("  Batch Slither run failed; analyzing contracts one at a time")
+                for idx in groups:
+                    future = executor.submit(_analyze_one, "slither", addresses[idx], api_key, timeout, precompile)
+                    futures[future] = ("slither", idx)
+
+        for future in as_completed(futures):
+            tool, idx = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'address': checksum(addresses[idx]), 'success': False, 'error': str(e)}
+            for _, dup_result in with_duplicates(idx, result, groups, addresses):
+                yield tool, dup_result
+
+
+def _print_result(tool: str, result: Dict) -> None:
+    """Print the one-contract summary for an analysis that found issues."""
+    issue_count = result['issue_count']
+    if tool == "slither":
+        impact = result.get('impact_breakdown', {})
+        print(f"  ✓ Found {issue_count} issues:")
+        print(f"    🔴 High: {impact.get('High', 0)}")
+        print(f"    🟡 Medium: {impact.get('Medium', 0)}")
+        print(f"    🔵 Low: {impact.get('Low', 0)}")
+        print(f"    ℹ️  Info: {impact.get('Informational', 0)}")
+        print(f"    ⚡ Opt: {impact.get('Optimization', 0)}")
+    else:
+        severity = result.get('severity_breakdown', {})
+        print(f"  ✓ Found {issue_count} issues:")
+        print(f"    🔴 High: {severity.get('High', 0)}")
+        print(f"    🟡 Medium: {severity.get('Medium', 0)}")
+        print(f"    🟢 Low: {severity.get('Low', 0)}")
+
+
+def _print_vulnerable(tool: str, vuln_contracts: List[Dict]) -> None:
+    """Print the closing list of contracts with High/Medium findings."""
+    print(f"\n{'='*70}")
+    print(f"{tool.upper()}: CONTRACTS WITH VULNERABILITIES ({len(vuln_contracts)})")
+    print(f"{'='*70}")
+
+    for result in vuln_contracts:
+        print(f"\n{result.get('address', 'Unknown')}")
+        print(f"  Total Issues: {result.get('issue_count', 0)}")
+
+        if tool == "slither":
+            impact = result.get('impact_breakdown', {})
+            print(f"  🔴 High: {impact.get('High', 0)}  "
+                  f"🟡 Medium: {impact.get('Medium', 0)}  "
+                  f"🔵 Low: {impact.get('Low', 0)}  "
+                  f"ℹ️  Info: {impact.get('Informational', 0)}  "
+                  f"⚡ Opt: {impact.get('Optimization', 0)}")
+            critical_issues = [
+                i for i in result.get('issues', [])
+                if i.get('impact') in ['High', 'Medium']
+            ]
+            if critical_issues:
+                print(f"  Critical Issues:")
+                for issue in critical_issues[:5]:  # First 5 critical issues
+                    print(f"    - [{issue.get('impact')}] {issue.get('check')}: {issue.get('description', '')[:80]}...")
+        else:
+            severity = result.get('severity_breakdown', {})
+            print(f"  🔴 High: {severity.get('High', 0)}  "
+                  f"🟡 Medium: {severity.get('Medium', 0)}  "
+                  f"🟢 Low: {severity.get('Low', 0)}")
+            critical_issues = [
+                i for i in result.get('issues', [])
+                if i.get('severity') in ['High', 'Medium']
+            ]
+            if critical_issues:
+                print(f"  Critical Issues:")
+                for issue in critical_issues:
+                    print(f"    - [{issue.get('severity')}] {issue.get('title')}")
+
+
+def _print_clone_clusters(tool: str, vuln_contracts: List[Dict],
+                          adjacency: Dict[str, List[Tuple[str, float]]]) -> None:
+    """Report vulnerable contracts that are also >= 95% clones of each other."""
+    print(f"\n{'='*70}")
+    print(f"{tool.upper()}: CLONE CLUSTER ANALYSIS")
+    print(f"{'='*70}")
+
+    if len(vuln_contracts) < 2:
+        return
+
+    vuln_addresses = {r['address'] for r in vuln_contracts}
+
+    # Walk only the neighbours of vulnerable contracts instead of every pair
+    similar_pairs = []
+    for addr in vuln_addresses:
+        for other, full_sim in adjacency.get(addr, []):
+            # addr < other keeps each pair once
+            if addr < other and other in vuln_addresses and full_sim >= PRIORITY_THRESHOLD:
+                similar_pairs.append((addr, other, full_sim * 100))  # Convert to percentage
+
+    if similar_pairs:
+        print(f"\nFound {len(similar_pairs)} vulnerable clone pairs:")
+        for addr1, addr2, similarity in similar_pairs[:10]:
+            print(f"  {addr1[:10]}... ↔ {addr2[:10]}... ({similarity:.1f}% similar)")
+    else:
+        print("\nNo vulnerable contracts are clones of each other.")
+
+
+def _tally(summary: Dict, result: Dict) -> str:
+    """Add one result to a tool's counters; returns skipped/failed/clean/vulnerable."""
+    if result.get('status') == 'skipped':
+        summary['skipped'] += 1
+        return "skipped"
+    if not result.get('success'):
+        summary['failed'] += 1
+        return "failed"
+
+    summary['successful'] += 1
+    issue_count = result.get('issue_count', 0)
+    if not issue_count:
+        # Clean contracts (the majority) need no breakdown or issue walk
+        return "clean"
+
+    summary['total_issues'] += issue_count
+    summary['vuln_contracts'].append(result)
+    return "vulnerable"
+
+
+def _print_progress(i: int, total: int, tool: str, result: Dict, status: str) -> None:
+    """Verbose per-contract progress lines."""
+    print(f"\n[{i}/{total}] {tool}: {result['address'][:10]}...")
+    if result.get('deduped_from'):
+        print(f"  = Identical source to {result['deduped_from'][:10]}..., reusing its result")
+
+    if status == "skipped":
+        print(f"  ✗ Skipped: Source code not available")
+    elif status == "failed":
+        error = result.get('error', 'Unknown error')
+        print(f"  ✗ Failed: {error[:100]}")
+    elif status == "clean":
+        print(f"  ✓ No vulnerabilities detected")
+    else:
+        _print_result(tool, result)
+
+
+def report_phase(results: Iterable[Tuple[str, Dict]], tools: Iterable[str], mode: str,
+                 total_contracts: int, verbose: bool = False) -> Dict[str, Dict]:
+    """
+    Stream results to <tool>_<mode>_report.jsonl as they arrive and write a
+    small <tool>_<mode>_summary.json per tool. Only counters and the
+    vulnerable results stay in memory.
+
+    Progress is a single tqdm bar, with vulnerable contracts logged as they
+    are found; verbose=True (or no tqdm installed) prints every contract.
+
+    Returns:
+        {tool: summary dict, with the vulnerable results under 'vuln_contracts'}
+    """
+    tools = tuple(tools)
+    outputs = {}
+    summaries = {}
+    for tool in tools:
+        results_file = f"{tool}_{mode}_report.jsonl"
+        outputs[tool] = open(results_file, 'wb')
+        summaries[tool] = {
+            'tool': tool,
+            'mode': mode,
+            'total_contracts': total_contracts,
+            'successful': 0,
+            'failed': 0,
+            'skipped': 0,
+            'total_issues': 0,
+            'results_file': results_file,
+            'vuln_contracts': []
+        }
+
+    total = total_contracts * len(tools)
+    # One progress bar instead of several printed lines per contract
+    bar = None if verbose or tqdm is None else tqdm(total=total, desc="Analyzing", unit="contract")
+    try:
+        with logging_redirect_tqdm() if bar is not None else nullcontext():
+            for i, (tool, result) in enumerate(results, 1):
+                summary = summaries[tool]
+                write_jsonl(outputs[tool], result)
+                status = _tally(summary, result)
+
+                if bar is None:
+                    _print_progress(i, total, tool, result, status)
+                    continue
+
+                bar.update()
+                bar.set_postfix(refresh=False, **{
+                    key: sum(s[key] for s in summaries.values())
+                    for key in ('successful', 'failed', 'skipped')
+                })
+                if status == "vulnerable":
+                    logger.warning("%s: %s has %d issues", tool, result['address'], result['issue_count'])
+    finally:
+        if bar is not None:
+            bar.close()
+        for out in outputs.values():
+            out.close()
+
+    for tool, summary in summaries.items():
+        output_file = f"{tool}_{mode}_summary.json"
+        report = {k: v for k, v in summary.items() if k != 'vuln_contracts'}
+        if mode == "prioritized":
+            report['similarity_threshold'] = PRIORITY_THRESHOLD * 100
+            report['note'] = f'Analyzed contracts with >= {PRIORITY_THRESHOLD:.0%} similarity (likely clones)'
+        dump_json(report, output_file)
+
+        print(f"\n{'='*70}")
+        print(f"{tool.upper()} ANALYSIS COMPLETE ({mode})")
+        print(f"{'='*70}")
+        print(f"Contracts: {report['total_contracts']}")
+        print(f"Successful: {report['successful']}")
+        print(f"Failed: {report['failed']}")
+        print(f"Skipped: {report['skipped']}")
+        print(f"Total Issues Found: {report['total_issues']}")
+        print(f"\nSummary saved to: {output_file}")
+        print(f"Per-contract results: {report['results_file']}")
+
+    return summaries
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Mythril/Slither vulnerability analysis of NFT contracts")
+    parser.add_argument("--tool", choices=TOOLS + ("both",), default="both",
+                        help="Analyzer(s) to run (default: both)")
+    parser.add_argument("--mode", choices=MODES, default="all",
+                        help="all contracts, the first --limit (default 15), or >=95%% similar clones")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Analyze at most this many contracts")
+    parser.add_argument("--batch", action="store_true",
+                        help="Run Slither once over all contracts (needs a common solc version)")
+    parser.add_argument("--precompile", action="store_true",
+                        help="Cache crytic-compile artifacts for Slither so reruns skip solc; "
+                             "cold runs add a crytic-compile step per contract and Mythril still compiles itself")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print every contract instead of a progress bar")
+    parser.add_argument("--clean", action="store_true",
+                        help="Delete the shared contract source cache when done")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    tools = TOOLS if args.tool == "both" else (args.tool,)
+
+    # Fail once up front rather than on every contract when a tool is missing
+    if "slither" in tools and shutil.which("slither") is None:
+        print("✗ Slither not found. Install with: pip install slither-analyzer")
+        return
+
+    # Check Mythril installation (myth runs natively or through WSL)
+    if "mythril" in tools and (MythrilAnalyzer is None
+                               or not (shutil.which("myth") or shutil.which("wsl"))
+                               or not MythrilAnalyzer.check_mythril_installation()):
+        print("\nPlease install Mythril in WSL Ubuntu first:")
+        print("  wsl sudo apt install -y pipx")
+        print("  wsl pipx install mythril")
+        print("  wsl pipx ensurepath")
+        return
+
+    # Load configuration
+    config = load_config()
+
+    api_key = config.get("etherscan_api_key") or os.environ.get("ETHERSCAN_API_KEY")
+    if not api_key:
+        print("Error: No Etherscan API key found")
+        return
+
+    try:
+        addresses, adjacency = select_addresses(args.mode, args.limit)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return
+
+    print(f"\n{'='*70}")
+    print(f"{' + '.join(t.upper() for t in tools)} VULNERABILITY ANALYSIS ({args.mode.upper()})")
+    print(f"{'='*70}")
+    print(f"Contracts to analyze: {len(addresses)}\n")
+
+    sources = fetch_phase(addresses, api_key)
+    results = analyze_phase(addresses, sources, tools, api_key,
+                            timeout=MYTHRIL_TIMEOUT[args.mode], batch=args.batch,
+                            precompile=args.precompile)
+    summaries = report_phase(results, tools, args.mode, len(addresses), verbose=args.verbose)
+
+    for tool, summary in summaries.items():
+        if summary['vuln_contracts']:
+            _print_vulnerable(tool, summary['vuln_contracts'])
+        if args.mode == "prioritized":
+            _print_clone_clusters(tool, summary['vuln_contracts'], adjacency)
+
+    # Source files are shared with the other analysis scripts; only remove on request
+    if args.clean and SOURCES_DIR.exists():
+        shutil.rmtree(SOURCES_DIR)
+        print(f"\nShared contract sources cleaned up")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
-import sys
-sys.path.append('.')
 from slither_analyzer import SlitherAnalyzer
 import os
+import tempfile
 import json
 
 # Read from vulnerability report to get the source code
@@ -15,21 +14,28 @@ test_json = '''{{
   }
 }}'''
 
-main_file, is_multi, tempdir = SlitherAnalyzer._extract_all_contracts(test_json)
 
-print(f"Main file selected: {main_file}")
-print(f"Is multi-file: {is_multi}")
+def main():
+    """Check that the contracts/ file is picked over the library one."""
+    # The extraction directory is removed on exit, even if the script is interrupted
+    with tempfile.TemporaryDirectory(prefix="slither_contracts_") as out_dir:
+        main_file, is_multi, tempdir, *_ = SlitherAnalyzer._extract_all_contracts(test_json, out_dir=out_dir)
 
-if tempdir and os.path.exists(tempdir):
-    print(f"\nFiles extracted:")
-    for root, dirs, files in os.walk(tempdir):
-        for file in files:
-            filepath = os.path.join(root, file)
-            relative = os.path.relpath(filepath, tempdir)
-            is_main = filepath == main_file
-            marker = " ← MAIN FILE" if is_main else ""
-            print(f"  {relative}{marker}")
-    
-    # Cleanup
-    import shutil
-    shutil.rmtree(tempdir, ignore_errors=True)
+        print(f"Main file selected: {main_file}")
+        print(f"Is multi-file: {is_multi}")
+
+        if tempdir:
+            print(f"\nFiles extracted:")
+            # Paths under tempdir are built and made relative by plain string operations
+            prefix = len(tempdir) + len(os.sep)
+            for root, dirs, files in os.walk(tempdir):
+                for file in files:
+                    filepath = f"{root}{os.sep}{file}"
+                    relative = filepath[prefix:]
+                    is_main = filepath == main_file
+                    marker = " ← MAIN FILE" if is_main else ""
+                    print(f"  {relative}{marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import json
+from slither_analyzer import report_output
 
 with open('vulnerability_report.json', 'r') as f:
-    data = json.load(f)
+    # Slither's text output per contract
+    data = {address: report_output(entry) for address, entry in json.load(f).items()}
 
 total = len(data)
 success = sum(1 for v in data.values() if "Traceback" not in v)
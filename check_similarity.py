@@ -1,14 +1,22 @@
 import json
+from code_similarity import SIMILARITY_STORE_THRESHOLD
 
 with open('similarity_report.json', 'r') as f:
     similarity = json.load(f)
 
-total = len(similarity)
+# The report only keeps pairs at or above the store threshold; the number of pairs
+# compared is in the summary written by run_complete_analysis.py
+try:
+    with open('ANALYSIS_SUMMARY.json', 'r') as f:
+        total = json.load(f)['similarity_analysis']['total_pairs_analyzed']
+except (OSError, ValueError, KeyError, TypeError):
+    total = None
 high_full = [(k, v['full_similarity']) for k, v in similarity.items() if v['full_similarity'] > 0.8]
 high_partial = [(k, v['partial_similarity']) for k, v in similarity.items() if v['partial_similarity'] > 0.8]
 
 print(f"✓ Similarity Analysis Results:")
-print(f"  Total comparisons: {total}")
+print(f"  Total comparisons: {total if total is not None else 'unknown (no ANALYSIS_SUMMARY.json)'}")
+print(f"  Pairs stored (≥{SIMILARITY_STORE_THRESHOLD:.0%} on either metric): {len(similarity)}")
 print(f"  High full similarity (>80%): {len(high_full)}")
 print(f"  High partial similarity (>80%): {len(high_partial)}")
 
@@ -2,6 +2,12 @@ import difflib
 import re
 import hashlib
 
+# Pairs scoring below this on both metrics are not stored in similarity reports;
+# the downstream reports only bucket pairs at >= 0.50, so absent pairs read as 0.
+SIMILARITY_STORE_THRESHOLD = 0.50
+# Files longer than this are compared by a 10K-char sample in full_similarity
+SAMPLE_THRESHOLD = 50000
+
 
 class CodeSimilarity:
     @staticmethod
@@ -12,7 +18,7 @@ class CodeSimilarity:
             return 1.0
         
         # For very large files, use hash-based comparison + sampling
-        if len(code1) > 50000 or len(code2) > 50000:
+        if len(code1) > SAMPLE_THRESHOLD or len(code2) > SAMPLE_THRESHOLD:
             # Check if hashes match (perfect similarity)
             if hashlib.md5(code1.encode()).hexdigest() == hashlib.md5(code2.encode()).hexdigest():
                 return 1.0
@@ -24,6 +30,15 @@ class CodeSimilarity:
         # Standard comparison for smaller files
         return difflib.SequenceMatcher(None, code1, code2).ratio()
 
+    @staticmethod
+    def full_similarity_below_half(len1, len2):
+        """
+        True if full_similarity is known to be < 0.5 from the lengths alone.
+        A whole-file ratio is at most 2*min/(len1+len2), which is < 0.5 once one file
+        is over 3x the other; sampled (> SAMPLE_THRESHOLD) files have no such bound.
+        """
+        return max(len1, len2) <= SAMPLE_THRESHOLD and max(len1, len2) > 3 * min(len1, len2)
+
     @staticmethod
     def _solidity_function_names(code: str):
         """Extract Solidity function names via regex. Handles standard function definitions."""
@@ -0,0 +1,206 @@
+"""
+Shared helpers for fetching verified contract sources.
+Fetched sources are cached under ~/.cache/nft_sim so repeated runs of the
+analysis scripts don't hit Etherscan again for the same address.
+"""
+
+import asyncio
+import functools
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from eth_utils.address import to_checksum_address
+from json_io import dumps, loads
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+CACHE_ROOT = Path.home() / ".cache" / "nft_sim"
+ETHERSCAN_CACHE_DIR = CACHE_ROOT / "etherscan"
+SOURCES_DIR = CACHE_ROOT / "sources"
+RESPONSE_CACHE_DIR = CACHE_ROOT / "responses"
+# Verified source is immutable; the TTL is only a safety net for bad entries
+ETHERSCAN_CACHE_TTL = 30 * 86400
+# Contracts can be verified later, so a missing source is only trusted for a day
+UNVERIFIED_CACHE_TTL = 86400
+# Creation records are immutable; the TTL is only a safety net for bad entries
+CREATION_CACHE_TTL = 86400
+# Transaction lists grow, so they are only reused by reruns within the hour
+ACTIVITY_CACHE_TTL = 3600
+
+
+@functools.lru_cache(maxsize=None)
+def checksum(address):
+    """
+    EIP-55 checksum address, or the input unchanged if it isn't a valid address.
+    Memoized: each address is checksummed several times per run and the
+    Keccak-256 it needs is slow in pure Python.
+    """
+    try:
+        return to_checksum_address(address)
+    except Exception:
+        return address
+
+
+def read_cached_source(address, max_age=ETHERSCAN_CACHE_TTL):
+    """Cached source for address if an entry younger than max_age exists, else None."""
+    cache_file = ETHERSCAN_CACHE_DIR / f"{address}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < max_age:
+            return loads(cache_file.read_bytes())["source"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def is_cached_unverified(address, max_age=UNVERIFIED_CACHE_TTL):
+    """True if address was recorded as unverified less than max_age seconds ago."""
+    cache_file = ETHERSCAN_CACHE_DIR / f"{address}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < max_age:
+            return loads(cache_file.read_bytes())["source"] is None
+    except (OSError, ValueError, KeyError):
+        pass
+    return False
+
+
+def write_cached_source(address, source):
+    """Store a fetched source in the on-disk cache (None records an unverified address)."""
+    cache_file = ETHERSCAN_CACHE_DIR / f"{address}.json"
+    ETHERSCAN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Write to a temp file then rename so concurrent workers never see partial JSON
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_file.write_bytes(dumps({"address": address, "source": source}, indent=False))
+    os.replace(tmp_file, cache_file)
+
+
+async def fetch_all(client, addresses, max_concurrency=5, max_age=ETHERSCAN_CACHE_TTL):
+    """
+    Fetch sources for all addresses concurrently and populate the on-disk
+    cache, so later get_contract_source calls never wait on the network.
+    At most max_concurrency requests are in flight and each slot is held for
+    at least a second, which keeps us under Etherscan's 5 req/s free tier.
+    
+    Addresses Etherscan answers for without source are recorded as unverified
+    and not requested again for UNVERIFIED_CACHE_TTL, as in get_contract_source.
+    Failed requests (network errors, rate limiting) are not recorded.
+    
+    Returns {address: source or None}.
+    """
+    sources = {a: read_cached_source(a, max_age) for a in addresses}
+    missing = [a for a, src in sources.items() if src is None and not is_cached_unverified(a)]
+    if not missing:
+        return sources
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(address, get_response):
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                data = await get_response(address)
+            except Exception:
+                data = {}
+            await asyncio.sleep(max(0.0, 1.0 - (time.monotonic() - started)))
+        # status "1" means Etherscan answered; an empty SourceCode is then unverified
+        return address, client.parse_source(data), data.get("status") == "1"
+
+    if httpx is None:
+        # No async HTTP client installed: run the blocking client in threads
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+        async def get_response(address):
+            return await loop.run_in_executor(executor, client.get_source_response, address)
+
+        try:
+            results = await asyncio.gather(*(fetch(a, get_response) for a in missing))
+        finally:
+            executor.shutdown(wait=False)
+    else:
+        limits = httpx.Limits(max_connections=max_concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=20) as http:
+            async def get_response(address):
+                resp = await http.get(client.base_url, params=client.source_params(address))
+                resp.raise_for_status()
+                return loads(resp.content)
+
+            results = await asyncio.gather(*(fetch(a, get_response) for a in missing))
+
+    for address, src, answered in results:
+        if src:
+            write_cached_source(address, src)
+        elif answered:
+            write_cached_source(address, None)
+        sources[address] = src
+    return sources
+
+
+def pick_main_file(contract_data):
+    """
+    Return (filename, code) for the file to analyze. Multi-file sources use
+    the first .sol or "contract" file; single-file sources return (None, code).
+    """
+    if not isinstance(contract_data, dict):
+        return None, contract_data
+    items = list(contract_data.items())
+    return next(((name, code) for name, code in items
+                 if name.endswith('.sol') or 'contract' in name.lower()), items[0])
+
+
+def group_identical_sources(sources):
+    """
+    Group the indices of byte-identical sources (clones are common in the
+    similarity-prioritized input). Returns {first index: [duplicate indices]};
+    None entries are left out.
+    """
+    first_by_hash = {}
+    groups = {}
+    for idx, src in enumerate(sources):
+        if src is None:
+            continue
+        first = first_by_hash.setdefault(hashlib.sha256(src.encode('utf-8')).digest(), idx)
+        if first == idx:
+            groups[idx] = []
+        else:
+            groups[first].append(idx)
+    return groups
+
+
+def with_duplicates(idx, result, groups, addresses):
+    """
+    Yield (idx, result), then a copy of result for each address whose source
+    is identical to addresses[idx], so clones are analyzed only once.
+    """
+    yield idx, result
+    for dup in groups.get(idx, ()):
+        yield dup, dict(result, address=checksum(addresses[dup]), deduped_from=result.get('address'))
+
+
+def ensure_source_on_disk(address, name, code):
+    """
+    Materialize code as SOURCES_DIR/<address>/<name>.sol and return the path.
+    The directory is shared by all analysis scripts, so the write is skipped
+    when a file with the same content hash is already there from an earlier run.
+    """
+    path = SOURCES_DIR / address / f"{name}.sol"
+    data = code.encode('utf-8')
+    try:
+        # Size first, so the hash is only computed for likely matches
+        if (path.stat().st_size == len(data)
+                and hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest()):
+            return path
+    except OSError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temp file then rename so concurrent analyzers never read a partial file
+    tmp_file = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, path)
+    return path
@@ -1,27 +1,222 @@
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import threading
+import time
+
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from contract_sources import (
+    ETHERSCAN_CACHE_TTL, RESPONSE_CACHE_DIR, UNVERIFIED_CACHE_TTL, checksum, is_cached_unverified,
+    read_cached_source, write_cached_source,
+)
+from json_io import dumps, load_config, loads
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_MESSAGE = "Max calls per sec"
+# An unverified contract's result starts with an empty SourceCode; seeing it
+# in the first chunk means the rest of the body isn't worth reading
+UNVERIFIED_MARKER = b'"SourceCode":""'
+UNVERIFIED_RESPONSE = {"status": "1", "message": "OK", "result": [{"SourceCode": ""}]}
+HEAD_BYTES = 4096
+
+
+class TokenBucket:
+    """Thread-safe token bucket: at most `rate` acquisitions per `per` seconds."""
+
+    def __init__(self, rate, per=1.0):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.fill_rate)
+
+
+# Etherscan's free tier allows 5 calls/sec per key, shared by every caller in the process
+RATE_LIMITER = TokenBucket(5, 1.0)
+
+
+def make_session():
+    """Keep-alive requests.Session that retries throttled and failed calls with backoff."""
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry))
+    return session
+
+
+def _response_cache_file(url, params):
+    """
+    Cache file for a GET of url with params. The API key is keyed by its hash, so an
+    answer fetched with one key is never served to a request made with another.
+    """
+    query = sorted((k, hashlib.sha256(str(v).encode()).hexdigest() if k == "apikey" else str(v))
+                   for k, v in params.items())
+    return RESPONSE_CACHE_DIR / f"{hashlib.sha256(dumps([url, query], indent=False)).hexdigest()}.json"
+
+
+def _read_cached_response(cache_file, max_age):
+    """Cached response if younger than max_age seconds, else None."""
+    try:
+        if time.time() - cache_file.stat().st_mtime < max_age:
+            return loads(cache_file.read_bytes())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _write_cached_response(cache_file, data):
+    """Cache data if Etherscan answered successfully (status "1")."""
+    if data.get("status") == "1":
+        RESPONSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_file.write_bytes(dumps(data, indent=False))
+        os.replace(tmp_file, cache_file)
+
+
+def cached_get(session, url, params, max_age, timeout=20):
+    """
+    GET url and return the parsed JSON, reusing an on-disk copy younger than
+    max_age seconds (0 always goes to the network). Keyed by the query, with the
+    API key hashed; only successful (status "1") answers are cached. Network
+    calls go through RATE_LIMITER.
+    """
+    cache_file = _response_cache_file(url, params)
+    data = _read_cached_response(cache_file, max_age)
+    if data is not None:
+        return data
+
+    RATE_LIMITER.acquire()
+    resp = session.get(url, params=params, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.json()
+    _write_cached_response(cache_file, data)
+    return data
+
+
+async def cached_get_async(http, url, params, max_age, timeout=20):
+    """
+    cached_get for an httpx.AsyncClient: same on-disk cache and rate limit,
+    but the request itself doesn't hold a thread while it waits.
+    """
+    cache_file = _response_cache_file(url, params)
+    data = _read_cached_response(cache_file, max_age)
+    if data is not None:
+        return data
+
+    # The bucket sleeps to throttle; do that off the event loop
+    await asyncio.to_thread(RATE_LIMITER.acquire)
+    resp = await http.get(url, params=params, timeout=timeout)
+    resp.raise_for_status()
+    data = loads(resp.content)
+    _write_cached_response(cache_file, data)
+    return data
+
 
 class EtherscanClient:
+    _rate_limiter = RATE_LIMITER
+
     def __init__(self, api_key):
         self.api_key = api_key
         self.base_url = "https://api.etherscan.io/v2/api"
+        # One keep-alive session for all calls instead of a TLS handshake per address
+        self._session = make_session()
 
-    def get_contract_source(self, address):
-        params = {
+    def source_params(self, address):
+        """Query parameters for a getsourcecode request."""
+        return {
             "chainid": "1",  # Ethereum mainnet
             "module": "contract",
             "action": "getsourcecode",
             "address": address,
             "apikey": self.api_key
         }
-        try:
-            resp = requests.get(self.base_url, params=params, timeout=20)
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception:
-            return None
+
+    @staticmethod
+    def parse_source(data):
+        """Extract SourceCode from a getsourcecode response, or None if unverified."""
         if data.get("status") == "1" and data.get("result"):
             src = data["result"][0].get("SourceCode")
             if src:
                 return src
         return None
+
+    @staticmethod
+    def is_rate_limited(data):
+        """True if Etherscan rejected the call for exceeding the per-second limit."""
+        return data.get("status") == "0" and RATE_LIMIT_MESSAGE in str(data.get("result", ""))
+
+    def get_source_response(self, address, retries=3):
+        """Raw getsourcecode response; raises on network/HTTP errors."""
+        for attempt in range(retries + 1):
+            self._rate_limiter.acquire()
+            with self._session.get(self.base_url, params=self.source_params(address),
+                                   timeout=20, stream=True) as resp:
+                resp.raise_for_status()
+                head = resp.raw.read(HEAD_BYTES, decode_content=True)
+                if UNVERIFIED_MARKER in head:
+                    return UNVERIFIED_RESPONSE
+                data = loads(head + resp.raw.read(decode_content=True))
+            if not self.is_rate_limited(data) or attempt == retries:
+                return data
+            logger.warning("Etherscan rate limit hit for %s, retrying (%d/%d)", address, attempt + 1, retries)
+            time.sleep(1.0)
+
+    def get_contract_source(self, address, force_refresh=False, max_age=ETHERSCAN_CACHE_TTL):
+        """
+        Verified source for address, or None.
+        Served from the on-disk cache (keyed by checksum address) unless
+        force_refresh is set. Unverified addresses are remembered for a day
+        and not re-requested in that time.
+        """
+        key = checksum(address)
+        if not force_refresh:
+            source = read_cached_source(key, max_age)
+            if source is not None:
+                return source
+            if is_cached_unverified(key, UNVERIFIED_CACHE_TTL):
+                return None
+        try:
+            data = self.get_source_response(address)
+        except Exception:
+            return None
+        source = self.parse_source(data)
+        if source:
+            write_cached_source(key, source)
+        elif data.get("status") == "1":
+            # Etherscan answered: the contract is unverified (not a transient failure)
+            write_cached_source(key, None)
+        return source
+
+    def get_contract_sources(self, addresses):
+        """
+        Fetch sources for several addresses over the shared session.
+        getsourcecode only accepts a single address, so this is one request
+        per address; returns {address: source or None}.
+        """
+        return {address: self.get_contract_source(address) for address in addresses}
+
+
+@functools.lru_cache(maxsize=1)
+def get_client(config_path="config.json"):
+    """
+    Shared EtherscanClient for scripts, built once per interpreter from
+    config.json (or the ETHERSCAN_API_KEY env var).
+    """
+    config = load_config(config_path)
+    return EtherscanClient(config.get("etherscan_api_key") or os.environ.get("ETHERSCAN_API_KEY"))
@@ -7,19 +7,19 @@ Extracts temporal features from:
 
 import json
 import time
-import requests
 from datetime import datetime
 from collections import defaultdict
 import os
 from typing import Dict, List, Tuple
+from contract_sources import ACTIVITY_CACHE_TTL, CREATION_CACHE_TTL
+from etherscan_client import cached_get, make_session
+from json_io import load_config
 
 # Load configuration
-def load_config():
+def load_api_key():
     """Load API key from config.json"""
     try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-            return config.get('etherscan_api_key', '')
+        return load_config().get('etherscan_api_key', '')
     except FileNotFoundError:
         print("Warning: config.json not found, trying environment variable...")
         return os.getenv('ETHERSCAN_API_KEY', 'YourApiKeyToken')
@@ -28,16 +28,15 @@ def load_config():
         return ''
 
 # Configuration
-ETHERSCAN_API_KEY = load_config()
-ETHERSCAN_API_URL = 'https://api.etherscan.io/api'
-RATE_LIMIT_DELAY = 0.2  # 5 requests per second
+ETHERSCAN_API_KEY = load_api_key()
+ETHERSCAN_API_URL = 'https://api.etherscan.io/v2/api'  # Using API V2
 
 class TemporalFeatureExtractor:
     """Extract temporal features from blockchain transactions"""
     
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = make_session()
         
     def get_contract_creator(self, contract_address: str) -> Tuple[str, int]:
         """
@@ -45,6 +44,7 @@ class TemporalFeatureExtractor:
         Returns: (creator_address, creation_timestamp)
         """
         params = {
+            'chainid': '1',  # Ethereum mainnet
             'module': 'contract',
             'action': 'getcontractcreation',
             'contractaddresses': contract_address,
@@ -52,8 +52,7 @@ class TemporalFeatureExtractor:
         }
         
         try:
-            response = self.session.get(ETHERSCAN_API_URL, params=params, timeout=10)
-            data = response.json()
+            data = cached_get(self.session, ETHERSCAN_API_URL, params, CREATION_CACHE_TTL, timeout=10)
             
             if data['status'] == '1' and data['result']:
                 creator_info = data['result'][0]
@@ -75,6 +74,7 @@ class TemporalFeatureExtractor:
     def get_transaction_details(self, tx_hash: str) -> dict:
         """Get transaction details by hash"""
         params = {
+            'chainid': '1',  # Ethereum mainnet
             'module': 'proxy',
             'action': 'eth_getTransactionByHash',
             'txhash': tx_hash,
@@ -99,6 +99,7 @@ class TemporalFeatureExtractor:
     def get_block_by_number(self, block_number: int) -> dict:
         """Get block information by block number"""
         params = {
+            'chainid': '1',  # Ethereum mainnet
             'module': 'proxy',
             'action': 'eth_getBlockByNumber',
             'tag': hex(block_number),
@@ -116,6 +117,7 @@ class TemporalFeatureExtractor:
     def get_normal_transactions(self, address: str, start_block: int = 0) -> List[dict]:
         """Get normal ETH transactions for an address"""
         params = {
+            'chainid': '1',  # Ethereum mainnet
             'module': 'account',
             'action': 'txlist',
             'address': address,
@@ -128,9 +130,7 @@ class TemporalFeatureExtractor:
         }
         
         try:
-            time.sleep(RATE_LIMIT_DELAY)
-            response = self.session.get(ETHERSCAN_API_URL, params=params, timeout=15)
-            data = response.json()
+            data = cached_get(self.session, ETHERSCAN_API_URL, params, ACTIVITY_CACHE_TTL, timeout=15)
             
             if data['status'] == '1':
                 return data['result']
@@ -143,6 +143,7 @@ class TemporalFeatureExtractor:
     def get_internal_transactions(self, address: str, start_block: int = 0) -> List[dict]:
         """Get internal transactions for an address"""
         params = {
+            'chainid': '1',  # Ethereum mainnet
             'module': 'account',
             'action': 'txlistinternal',
             'address': address,
@@ -155,9 +156,7 @@ class TemporalFeatureExtractor:
         }
         
         try:
-            time.sleep(RATE_LIMIT_DELAY)
-            response = self.session.get(ETHERSCAN_API_URL, params=params, timeout=15)
-            data = response.json()
+            data = cached_get(self.session, ETHERSCAN_API_URL, params, ACTIVITY_CACHE_TTL, timeout=15)
             
             if data['status'] == '1':
                 return data['result']
@@ -170,6 +169,7 @@ class TemporalFeatureExtractor:
     def get_erc721_transfers(self, contract_address: str) -> List[dict]:
         """Get ERC721 token transfer events for a contract"""
         params = {
+            'chainid': '1',  # Ethereum mainnet
             'module': 'account',
             'action': 'tokennfttx',
             'contractaddress': contract_address,
@@ -180,9 +180,7 @@ class TemporalFeatureExtractor:
         }
         
         try:
-            time.sleep(RATE_LIMIT_DELAY)
-            response = self.session.get(ETHERSCAN_API_URL, params=params, timeout=15)
-            data = response.json()
+            data = cached_get(self.session, ETHERSCAN_API_URL, params, ACTIVITY_CACHE_TTL, timeout=15)
             
             if data['status'] == '1':
                 return data['result']
@@ -5,32 +5,31 @@ Focuses on smart contract transaction activity without requiring creator informa
 
 import json
 import time
-import requests
 from datetime import datetime
 from collections import defaultdict
 from typing import Dict, List
+from contract_sources import ACTIVITY_CACHE_TTL
+from etherscan_client import cached_get, make_session
+from json_io import load_config
 
 # Load configuration
-def load_config():
+def load_api_key():
     """Load API key from config.json"""
     try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-            return config.get('etherscan_api_key', '')
+        return load_config().get('etherscan_api_key', '')
     except:
         return ''
 
 # Configuration
-ETHERSCAN_API_KEY = load_config()
+ETHERSCAN_API_KEY = load_api_key()
 ETHERSCAN_API_URL = 'https://api.etherscan.io/v2/api'  # Using API V2
-RATE_LIMIT_DELAY = 0.21  # Slightly more than 5 req/sec to be safe
 
 class SimplifiedTemporalExtractor:
     """Extract temporal features focusing on contract activity"""
     
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = make_session()
         
     def get_normal_transactions(self, address: str) -> List[dict]:
         """Get normal ETH transactions for an address"""
@@ -48,9 +47,7 @@ class SimplifiedTemporalExtractor:
         }
         
         try:
-            time.sleep(RATE_LIMIT_DELAY)
-            response = self.session.get(ETHERSCAN_API_URL, params=params, timeout=15)
-            data = response.json()
+            data = cached_get(self.session, ETHERSCAN_API_URL, params, ACTIVITY_CACHE_TTL, timeout=15)
             
             if data['status'] == '1':
                 return data['result']
@@ -76,9 +73,7 @@ class SimplifiedTemporalExtractor:
         }
         
         try:
-            time.sleep(RATE_LIMIT_DELAY)
-            response = self.session.get(ETHERSCAN_API_URL, params=params, timeout=15)
-            data = response.json()
+            data = cached_get(self.session, ETHERSCAN_API_URL, params, ACTIVITY_CACHE_TTL, timeout=15)
             
             if data['status'] == '1':
                 return data['result']
@@ -102,9 +97,7 @@ class SimplifiedTemporalExtractor:
         }
         
         try:
-            time.sleep(RATE_LIMIT_DELAY)
-            response = self.session.get(ETHERSCAN_API_URL, params=params, timeout=15)
-            data = response.json()
+            data = cached_get(self.session, ETHERSCAN_API_URL, params, ACTIVITY_CACHE_TTL, timeout=15)
             
             if data['status'] == '1':
                 return data['result']
@@ -2,20 +2,31 @@ import json
 from pathlib import Path
 from collections import Counter, defaultdict
 import re
+from code_similarity import SIMILARITY_STORE_THRESHOLD
+from json_io import load_config, load_json
+
+# Written by run_complete_analysis.py; holds the pair total the sparse report lacks
+SUMMARY_FILE = Path('ANALYSIS_SUMMARY.json')
 
 def extract_function_names(code):
     """Extract all function names from Solidity code"""
     pattern = r"\bfunction\s+([A-Za-z_][A-Za-z0-9_]*)\s*\("
     return set(re.findall(pattern, code))
 
+def total_pairs_analyzed():
+    """Number of pairs compared, from the analysis summary, or None if unavailable."""
+    try:
+        return load_json(SUMMARY_FILE)['similarity_analysis']['total_pairs_analyzed']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
 def analyze_similarity_report():
     # Load similarity report
     report = json.loads(Path('similarity_report.json').read_text())
     entries = list(report.values())
     
     # Load contract source codes
-    with open('config.json') as f:
-        config = json.load(f)
+    config = load_config()
     
     # Sort by different metrics
     full_sorted = sorted(entries, key=lambda x: x['full_similarity'], reverse=True)
@@ -31,9 +42,13 @@ def analyze_similarity_report():
     medium_full = [e for e in entries if 0.5 <= e['full_similarity'] < 0.8]
     medium_partial = [e for e in entries if 0.5 <= e['partial_similarity'] < 0.8]
     
-    # Statistics
-    avg_full = sum(x['full_similarity'] for x in entries) / len(entries)
-    avg_partial = sum(x['partial_similarity'] for x in entries) / len(entries)
+    # Statistics. The report only stores pairs at or above the store threshold on
+    # either metric, so these cover stored pairs; the pair total comes from the summary
+    stored = len(entries)
+    total_pairs = total_pairs_analyzed()
+    stored_label = f"≥{SIMILARITY_STORE_THRESHOLD:.0%} pairs only"
+    avg_full = sum(x['full_similarity'] for x in entries) / stored if stored else 0.0
+    avg_partial = sum(x['partial_similarity'] for x in entries) / stored if stored else 0.0
     
     # Generate detailed report
     output = []
@@ -41,7 +56,8 @@ def analyze_similarity_report():
     output.append("NFT SMART CONTRACT SIMILARITY ANALYSIS - DETAILED REPORT")
     output.append("=" * 100)
     output.append(f"\nGenerated: October 28, 2025")
-    output.append(f"Total Contract Pairs Analyzed: {len(entries)}")
+    output.append(f"Total Contract Pairs Analyzed: {total_pairs if total_pairs is not None else 'unknown (no ' + str(SUMMARY_FILE) + ')'}")
+    output.append(f"Pairs Stored (≥{SIMILARITY_STORE_THRESHOLD:.0%} on either metric): {stored}")
     output.append(f"Total Unique Contracts: 78")
     output.append("\n" + "=" * 100)
     
@@ -134,27 +150,28 @@ Interpretation:
     
     output.append(f"\n2.1 SUMMARY METRICS")
     output.append("-" * 100)
-    output.append(f"  Total Comparisons:          {len(entries)}")
-    output.append(f"  Average Full Similarity:    {avg_full*100:.2f}%")
-    output.append(f"  Average Partial Similarity: {avg_partial*100:.2f}%")
+    output.append(f"  Total Comparisons:          {total_pairs if total_pairs is not None else 'unknown'}")
+    output.append(f"  Stored Pairs:               {stored} ({stored_label})")
+    output.append(f"  Average Full Similarity:    {avg_full*100:.2f}% ({stored_label})")
+    output.append(f"  Average Partial Similarity: {avg_partial*100:.2f}% ({stored_label})")
     output.append(f"  High Full Similarity (≥80%):    {len(high_full)} pairs")
     output.append(f"  High Partial Similarity (≥80%): {len(high_partial)} pairs")
     output.append(f"  Medium Full Similarity (50-80%):    {len(medium_full)} pairs")
     output.append(f"  Medium Partial Similarity (50-80%): {len(medium_partial)} pairs")
     
-    output.append(f"\n2.2 FULL SIMILARITY DISTRIBUTION")
+    output.append(f"\n2.2 FULL SIMILARITY DISTRIBUTION ({stored_label})")
     output.append("-" * 100)
     for bucket in sorted(full_bins.keys()):
         count = full_bins[bucket]
-        percentage = (count / len(entries)) * 100
+        percentage = (count / stored) * 100
         bar = '█' * int(percentage / 2)
         output.append(f"  {bucket:02d}-{bucket+9:02d}%: {count:3d} pairs {bar} ({percentage:.1f}%)")
     
-    output.append(f"\n2.3 PARTIAL SIMILARITY DISTRIBUTION")
+    output.append(f"\n2.3 PARTIAL SIMILARITY DISTRIBUTION ({stored_label})")
     output.append("-" * 100)
     for bucket in sorted(partial_bins.keys()):
         count = partial_bins[bucket]
-        percentage = (count / len(entries)) * 100
+        percentage = (count / stored) * 100
         bar = '█' * int(percentage / 2)
         output.append(f"  {bucket:02d}-{bucket+9:02d}%: {count:3d} pairs {bar} ({percentage:.1f}%)")
     
@@ -224,7 +241,7 @@ Interpretation:
     output.append("\n" + "=" * 100)
     output.append("SECTION 5: COMPLETE COMPARISON MATRIX")
     output.append("=" * 100)
-    output.append("\nAll 325 contract pairs sorted by full similarity (highest to lowest):\n")
+    output.append(f"\nAll {stored} stored contract pairs ({stored_label}) sorted by full similarity (highest to lowest):\n")
     output.append("-" * 100)
     
     for i, item in enumerate(full_sorted, 1):
@@ -253,15 +270,15 @@ Interpretation:
     
     for contract in sorted(contract_similarities.keys()):
         sims = contract_similarities[contract]
-        avg_full = sum(s['full'] for s in sims) / len(sims)
-        avg_partial = sum(s['partial'] for s in sims) / len(sims)
+        contract_avg_full = sum(s['full'] for s in sims) / len(sims)
+        contract_avg_partial = sum(s['partial'] for s in sims) / len(sims)
         max_full = max(s['full'] for s in sims)
         max_partial = max(s['partial'] for s in sims)
         
         output.append(f"\nContract: {contract}")
-        output.append(f"  Comparisons: {len(sims)}")
-        output.append(f"  Average Full Similarity:    {avg_full*100:.2f}%")
-        output.append(f"  Average Partial Similarity: {avg_partial*100:.2f}%")
+        output.append(f"  Stored Pairs: {len(sims)} ({stored_label})")
+        output.append(f"  Average Full Similarity:    {contract_avg_full*100:.2f}%")
+        output.append(f"  Average Partial Similarity: {contract_avg_partial*100:.2f}%")
         output.append(f"  Max Full Similarity:        {max_full*100:.2f}%")
         output.append(f"  Max Partial Similarity:     {max_partial*100:.2f}%")
         
@@ -281,7 +298,7 @@ Interpretation:
     output.append(f"  • {len(critical)} contract pair(s) show near-identical code (≥95% similarity)")
     output.append(f"  • {len(high_risk)} contract pair(s) show very high similarity (80-95%)")
     output.append(f"  • {len(high_partial)} contract pair(s) share same function interface (≥80% partial)")
-    output.append(f"  • Average similarity across all pairs: {avg_full*100:.2f}% (full), {avg_partial*100:.2f}% (partial)")
+    output.append(f"  • Average similarity across stored pairs ({stored_label}): {avg_full*100:.2f}% (full), {avg_partial*100:.2f}% (partial)")
     
     output.append(f"\n7.2 RISK ASSESSMENT")
     output.append("-" * 100)
@@ -292,7 +309,7 @@ Interpretation:
         output.append(f"  ⚠️  HIGH RISK: {len(high_risk)} very similar contract pairs detected")
         output.append(f"      → May indicate template reuse or forked contracts")
     if avg_full > 0.3:
-        output.append(f"  ℹ️  INFO: Average similarity is {avg_full*100:.2f}%")
+        output.append(f"  ℹ️  INFO: Average similarity of stored pairs is {avg_full*100:.2f}%")
         output.append(f"      → Suggests common patterns/libraries across NFT contracts")
     
     output.append(f"\n7.3 RECOMMENDATIONS")
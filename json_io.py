@@ -0,0 +1,64 @@
+"""
+JSON helpers for reading and writing analysis reports.
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import functools
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+def dumps(obj, indent=True):
+    """Serialize obj to UTF-8 JSON bytes."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS matches the stdlib's handling of int/float dict keys
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def loads(data):
+    """Parse JSON from bytes, memoryview or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dump_json(obj, path, indent=True):
+    """Write obj as JSON to path (2-space indented by default)."""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent=indent))
+
+
+def load_json(path):
+    """Read and parse the JSON file at path."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(path='config.json'):
+    """
+    Parsed config.json, read once per interpreter and shared by every caller.
+    Treat the returned dict as read-only.
+    """
+    return load_json(path)
+
+
+def write_jsonl(f, obj):
+    """Append obj as one compact JSON line to a file opened in binary mode."""
+    f.write(dumps(obj, indent=False) + b'\n')
+
+
+def iter_jsonl(path):
+    """Yield the objects of a JSON Lines file one at a time."""
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
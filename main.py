@@ -1,17 +1,19 @@
-import json
 import os
 import argparse
+from json_io import dump_json, load_config
 from nft_contract_analyzer import NFTContractAnalyzer
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="NFT Smart Contract Analyzer")
     parser.add_argument("--input", required=True, help="Path to file with contract addresses (one per line)")
+    parser.add_argument("--analyzers", default=",".join(NFTContractAnalyzer.DEFAULT_ANALYZERS),
+                        help="Comma-separated vulnerability analyzers to run (mythril, slither)")
     args = parser.parse_args()
 
-    with open("config.json") as f:
-        config = json.load(f)
+    config = load_config()
     api_key = config.get("etherscan_api_key") or os.environ.get("ETHERSCAN_API_KEY")
-    analyzer = NFTContractAnalyzer(api_key or "")
+    analyzers = [name.strip() for name in args.analyzers.split(",") if name.strip()]
+    analyzer = NFTContractAnalyzer(api_key or "", analyzers=analyzers)
 
     with open(args.input) as f:
         # Read addresses, ignore blank lines and comments
@@ -27,9 +29,7 @@ if __name__ == "__main__":
     sim_report = analyzer.similarity_report()
     vuln_report = analyzer.vulnerability_report()
 
-    with open("similarity_report.json", "w") as f:
-        json.dump(sim_report, f, indent=2)
-    with open("vulnerability_report.json", "w") as f:
-        json.dump(vuln_report, f, indent=2)
+    dump_json(sim_report, "similarity_report.json")
+    dump_json(vuln_report, "vulnerability_report.json")
 
     print("Analysis complete. See output files for details.")
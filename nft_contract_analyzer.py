@@ -1,12 +1,25 @@
+import hashlib
 import json
 import time
+from collections import Counter
 from etherscan_client import EtherscanClient
-from code_similarity import CodeSimilarity
+from code_similarity import CodeSimilarity, SIMILARITY_STORE_THRESHOLD
 from mythril_analyzer import MythrilAnalyzer
+from slither_analyzer import SEVERITY_LEVELS, SlitherAnalyzer
 
 class NFTContractAnalyzer:
-    def __init__(self, api_key):
+    ANALYZERS = ("mythril", "slither")
+    # Mythril alone keeps the flat {address: result} report the readers expect
+    DEFAULT_ANALYZERS = ("mythril",)
+
+    def __init__(self, api_key, analyzers=DEFAULT_ANALYZERS):
+        unknown = set(analyzers) - set(self.ANALYZERS)
+        if unknown:
+            raise ValueError(f"Unknown analyzer(s): {', '.join(sorted(unknown))}")
+        if not analyzers:
+            raise ValueError("At least one analyzer is required")
         self.etherscan = EtherscanClient(api_key)
+        self.analyzers = tuple(analyzers)
         self.unavailable = []
         self.contracts = {}
         self.addresses = []  # Store addresses for direct bytecode analysis
@@ -32,56 +45,119 @@ class NFTContractAnalyzer:
         total_pairs = (len(addresses) * (len(addresses) - 1)) // 2
         pair_num = 0
         print(f"\nCalculating similarity for {total_pairs} contract pairs...")
+        hashes = {a: hashlib.sha256(c.encode()).digest() for a, c in self.contracts.items()}
+        lengths = {a: len(c) for a, c in self.contracts.items()}
         for i in range(len(addresses)):
             for j in range(i+1, len(addresses)):
                 pair_num += 1
                 a1, a2 = addresses[i], addresses[j]
                 print(f"[{pair_num}/{total_pairs}] Comparing {a1[:10]}... vs {a2[:10]}...", flush=True)
                 code1, code2 = self.contracts[a1], self.contracts[a2]
-                full = CodeSimilarity.full_similarity(code1, code2)
-                partial = CodeSimilarity.partial_similarity(code1, code2)
+                len1, len2 = lengths[a1], lengths[a2]
+                if hashes[a1] == hashes[a2]:
+                    # Exact duplicate
+                    full = partial = 1.0
+                elif CodeSimilarity.full_similarity_below_half(len1, len2):
+                    # Sizes differ by >3x: the full ratio can't reach the store threshold,
+                    # so only diff if function names alone qualify the pair
+                    partial = CodeSimilarity.partial_similarity(code1, code2)
+                    if partial < SIMILARITY_STORE_THRESHOLD:
+                        continue
+                    full = CodeSimilarity.full_similarity(code1, code2)
+                else:
+                    full = CodeSimilarity.full_similarity(code1, code2)
+                    partial = CodeSimilarity.partial_similarity(code1, code2)
+                # Only keep pairs similar enough to matter; the rest are implicitly 0
+                if max(full, partial) < SIMILARITY_STORE_THRESHOLD:
+                    continue
                 # Use string key for JSON compatibility
                 key = f"{a1}_{a2}"
                 report[key] = {"contract1": a1, "contract2": a2, "full_similarity": full, "partial_similarity": partial}
         return report
 
+    def _run_mythril(self, addr, timeout):
+        """Mythril bytecode analysis (works even without source code)."""
+        return MythrilAnalyzer.analyze_address(addr, timeout=timeout)
+
+    def _run_slither(self, addr, timeout):
+        """Slither source analysis; needs verified source from Etherscan."""
+        code = self.contracts.get(addr)
+        if not code:
+            return {"success": False, "error": "Source code not available"}
+        return SlitherAnalyzer.analyze_result(code)
+
+    @staticmethod
+    def _merge_results(results):
+        """
+        One report entry from {analyzer_name: result}: issues and counts summed over
+        the analyzers that succeeded, each result kept under "analyzers".
+        """
+        succeeded = {name: result for name, result in results.items() if result.get("success")}
+        counts = Counter()
+        for result in succeeded.values():
+            counts.update(result.get("severity_breakdown", {}))
+        entry = {
+            "success": bool(succeeded),
+            "issues": [
+                dict(issue, analyzer=name)
+                for name, result in succeeded.items()
+                for issue in result.get("issues", [])
+            ],
+            "issue_count": sum(result.get("issue_count", 0) for result in succeeded.values()),
+            "severity_breakdown": {sev: counts[sev] for sev in SEVERITY_LEVELS},
+            "analyzers": results
+        }
+        if not succeeded:
+            entry["error"] = "; ".join(f"{name}: {result.get('error', 'Unknown error')}"
+                                       for name, result in results.items())
+        return entry
+
     def vulnerability_report(self, timeout_per_contract=300):
         """
-        Run Mythril vulnerability analysis on all contracts.
-        Uses bytecode analysis for reliability (works even without source code).
+        Run each configured analyzer (Mythril and/or Slither) on all contracts.
+        Mythril uses bytecode analysis, so it also covers contracts without source code.
         
         Args:
             timeout_per_contract: Maximum seconds per contract analysis (default: 5 minutes)
+        
+        Returns:
+            {address: {"success", "issues", "issue_count", "severity_breakdown",
+                       "analyzers": {analyzer_name: result}}}, whichever analyzers ran
         """
         vulns = {}
         # Use all addresses (even those without source code)
         all_addresses = self.addresses if self.addresses else list(self.contracts.keys())
         total = len(all_addresses)
+        backends = {name: getattr(self, f"_run_{name}") for name in self.analyzers}
         
         print(f"\n{'='*70}")
-        print(f"Running Mythril vulnerability analysis on {total} contracts...")
-        print(f"Using bytecode analysis (works without source code)")
+        print(f"Running vulnerability analysis ({', '.join(self.analyzers)}) on {total} contracts...")
         print(f"Timeout per contract: {timeout_per_contract}s (~{timeout_per_contract//60} minutes)")
         print(f"{'='*70}\n")
         
         for idx, addr in enumerate(all_addresses, 1):
             print(f"[{idx}/{total}] Analyzing {addr}...")
+            results = {}
             
-            # Use bytecode analysis (more reliable than source code)
-            result = MythrilAnalyzer.analyze_address(addr, timeout=timeout_per_contract)
-            vulns[addr] = result
+            for name, run in backends.items():
+                result = run(addr, timeout_per_contract)
+                results[name] = result
+                
+                # Show quick summary
+                if not result.get("success"):
+                    error = result.get("error", "Unknown error")[:50]
+                    print(f"  ✗ {name}: Failed: {error}...")
+                elif "issue_count" in result:
+                    issues = result.get("issue_count", 0)
+                    severity = result.get("severity_breakdown", {})
+                    high = severity.get("High", 0)
+                    medium = severity.get("Medium", 0)
+                    low = severity.get("Low", 0)
+                    print(f"  ✓ {name}: {issues} issues (🔴{high} 🟡{medium} 🟢{low})")
+                else:
+                    print(f"  ✓ {name}: Complete")
             
-            # Show quick summary
-            if result.get("success"):
-                issues = result.get("issue_count", 0)
-                severity = result.get("severity_breakdown", {})
-                high = severity.get("High", 0)
-                medium = severity.get("Medium", 0)
-                low = severity.get("Low", 0)
-                print(f"  ✓ Complete: {issues} issues (🔴{high} 🟡{medium} 🟢{low})")
-            else:
-                error = result.get("error", "Unknown error")[:50]
-                print(f"  ✗ Failed: {error}...")
+            vulns[addr] = self._merge_results(results)
             
             # Add small delay to avoid overwhelming the system
             time.sleep(1)
@@ -6,40 +6,41 @@ Complete NFT Contract Analysis Pipeline
 4. Generate comprehensive reports
 """
 
-import json
+import hashlib
 import os
 import subprocess
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from etherscan_client import EtherscanClient
-from code_similarity import CodeSimilarity
+from code_similarity import CodeSimilarity, SIMILARITY_STORE_THRESHOLD
+from json_io import dump_json, load_config, load_json
 
 
 def save_contract_file(address, source_code, output_dir="retrieved_contracts"):
     """Save contract source code to a .sol file."""
     Path(output_dir).mkdir(exist_ok=True)
     filepath = os.path.join(output_dir, f"{address}.sol")
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(source_code)
+    with open(filepath, 'wb') as f:
+        f.write(source_code.encode('utf-8'))
     return filepath
 
 
-def analyze_with_slither(contract_file, address):
+def analyze_with_slither(contract_file, address, source_code):
     """
     Analyze a Solidity contract with Slither.
+    The source code is taken from memory (already fetched in Phase 1) so the
+    contract file is never re-read just to sniff its format.
     Returns analysis results dictionary.
     """
     try:
         # Save output to a temp JSON file (more reliable than stdout)
         temp_json = f"temp_slither_{address}.json"
         
-        # Check if the contract file is in Standard JSON format
-        with open(contract_file, 'r', encoding='utf-8') as f:
-            first_char = f.read(1)
-        
         # Use solc-select to automatically choose the right compiler version
         # This allows Slither to work with contracts using different Solidity versions
-        if first_char == '{':
+        if source_code.startswith('{'):
             # Standard JSON format - use --solc-standard-json flag
             cmd = ['slither', contract_file, '--json', temp_json, '--solc-disable-warnings', '--solc-standard-json']
         else:
@@ -55,8 +56,7 @@ def analyze_with_slither(contract_file, address):
         
         # Read the JSON output file
         if os.path.exists(temp_json):
-            with open(temp_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json(temp_json)
             
             # Clean up temp file
             os.remove(temp_json)
@@ -65,22 +65,17 @@ def analyze_with_slither(contract_file, address):
             if data.get('success'):
                 detectors = data.get('results', {}).get('detectors', [])
                 
-                issues = []
-                severity_counts = {'High': 0, 'Medium': 0, 'Low': 0, 'Informational': 0, 'Optimization': 0}
+                issues = [
+                    {
+                        'severity': detector.get('impact', 'Unknown'),
+                        'type': detector.get('check', 'unknown'),
+                        'description': detector.get('description', 'No description')
+                    }
+                    for detector in detectors
+                ]
                 
-                for detector in detectors:
-                    impact = detector.get('impact', 'Unknown')
-                    check = detector.get('check', 'unknown')
-                    description = detector.get('description', 'No description')
-                    
-                    issues.append({
-                        'severity': impact,
-                        'type': check,
-                        'description': description
-                    })
-                    
-                    if impact in severity_counts:
-                        severity_counts[impact] += 1
+                counts = Counter(issue['severity'] for issue in issues)
+                severity_counts = {sev: counts[sev] for sev in ('High', 'Medium', 'Low', 'Informational', 'Optimization')}
                 
                 return {
                     'success': True,
@@ -140,8 +135,7 @@ def main():
     
     # Load configuration
     try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
+        config = load_config()
         api_key = config.get('etherscan_api_key') or os.environ.get('ETHERSCAN_API_KEY')
         if not api_key:
             print("✗ No API key found in config.json or ETHERSCAN_API_KEY env var")
@@ -174,8 +168,12 @@ def main():
     print()
     
     contracts = {}
+    pending_writes = {}  # {address: future resolving to the saved .sol path}
     unavailable = []
     
+    # Write .sol files in the background so disk I/O overlaps the next fetch
+    writer = ThreadPoolExecutor(max_workers=2)
+    
     for idx, addr in enumerate(addresses, 1):
         print(f"[{idx}/{total_contracts}] Fetching {addr}...", end=" ", flush=True)
         source_code = etherscan.get_contract_source(addr)
@@ -187,11 +185,14 @@ def main():
             print(f"OK ({len(source_code)} chars)")
             contracts[addr] = source_code
             # Save to file for Slither
-            save_contract_file(addr, source_code)
+            pending_writes[addr] = writer.submit(save_contract_file, addr, source_code)
         
         # Rate limiting: 5 requests/second max for free tier
         time.sleep(0.25)
     
+    writer.shutdown(wait=True)
+    contract_files = {addr: future.result() for addr, future in pending_writes.items()}
+    
     # Log unavailable contracts
     if unavailable:
         with open("unavailable_contracts.txt", "w") as f:
@@ -222,6 +223,10 @@ def main():
     print(f"Analyzing {total_pairs} contract pairs...")
     print()
     
+    # Per-contract prefilter data, computed once instead of per pair
+    hashes = {a: hashlib.sha256(c.encode()).digest() for a, c in contracts.items()}
+    lengths = {a: len(c) for a, c in contracts.items()}
+    
     for i in range(len(contract_addresses)):
         for j in range(i+1, len(contract_addresses)):
             pair_num += 1
@@ -231,8 +236,24 @@ def main():
                 print(f"[{pair_num}/{total_pairs}] Comparing {a1[:10]}... vs {a2[:10]}...")
             
             code1, code2 = contracts[a1], contracts[a2]
-            full_sim = CodeSimilarity.full_similarity(code1, code2)
-            partial_sim = CodeSimilarity.partial_similarity(code1, code2)
+            len1, len2 = lengths[a1], lengths[a2]
+            if hashes[a1] == hashes[a2]:
+                # Exact duplicate
+                full_sim = partial_sim = 1.0
+            elif CodeSimilarity.full_similarity_below_half(len1, len2):
+                # Sizes differ by >3x: the full ratio can't reach the store threshold,
+                # so the expensive diff only runs if function names alone qualify the pair
+                partial_sim = CodeSimilarity.partial_similarity(code1, code2)
+                if partial_sim < SIMILARITY_STORE_THRESHOLD:
+                    continue
+                full_sim = CodeSimilarity.full_similarity(code1, code2)
+            else:
+                full_sim = CodeSimilarity.full_similarity(code1, code2)
+                partial_sim = CodeSimilarity.partial_similarity(code1, code2)
+            
+            # Sparse report: low-similarity pairs are implicitly 0
+            if max(full_sim, partial_sim) < SIMILARITY_STORE_THRESHOLD:
+                continue
             
             # Use string key for JSON compatibility
             key = f"{a1}_{a2}"
@@ -244,8 +265,7 @@ def main():
             }
     
     # Save similarity report
-    with open("similarity_report.json", "w") as f:
-        json.dump(similarity_report, f, indent=2)
+    dump_json(similarity_report, "similarity_report.json")
     
     # Calculate high-risk clones
     high_risk_pairs = [
@@ -255,6 +275,7 @@ def main():
     
     print()
     print(f"✓ Similarity analysis complete: {total_pairs} pairs analyzed")
+    print(f"  🗂  Pairs stored (≥{SIMILARITY_STORE_THRESHOLD:.0%} similar): {len(similarity_report)}")
     print(f"  📊 High-risk clone pairs (≥95% similar): {len(high_risk_pairs)}")
     print(f"  💾 Report saved to: similarity_report.json")
     print()
@@ -301,9 +322,9 @@ def main():
     for idx, addr in enumerate(contract_addresses, 1):
         print(f"[{idx}/{retrieved_count}] Analyzing {addr}...")
         
-        contract_file = os.path.join("retrieved_contracts", f"{addr}.sol")
+        contract_file = contract_files.get(addr)
         
-        if not os.path.exists(contract_file):
+        if contract_file is None:
             print(f"  ✗ Contract file not found")
             vulnerability_report[addr] = {
                 'success': False,
@@ -315,31 +336,33 @@ def main():
             continue
         
         # Run Slither analysis
-        result = analyze_with_slither(contract_file, addr)
+        result = analyze_with_slither(contract_file, addr, contracts[addr])
         vulnerability_report[addr] = result
         
         if result['success']:
             vuln_successful += 1
             issue_count = result['issue_count']
-            total_issues += issue_count
-            
-            severity = result.get('severity_breakdown', {})
-            high = severity.get('High', 0)
-            medium = severity.get('Medium', 0)
-            low = severity.get('Low', 0)
-            
-            total_high += high
-            total_medium += medium
-            total_low += low
             
-            if issue_count > 0:
+            if not issue_count:
+                # Clean contracts (the majority) have nothing to break down
+                print(f"  ✓ No issues found")
+            else:
+                total_issues += issue_count
+                
+                severity = result['severity_breakdown']
+                high = severity.get('High', 0)
+                medium = severity.get('Medium', 0)
+                low = severity.get('Low', 0)
+                
+                total_high += high
+                total_medium += medium
+                total_low += low
+                
                 print(f"  ✓ Found {issue_count} issues", end="")
                 if high > 0 or medium > 0 or low > 0:
                     print(f" (🔴{high} 🟡{medium} 🟢{low})")
                 else:
                     print()
-            else:
-                print(f"  ✓ No issues found")
         else:
             vuln_failed += 1
             error = result.get('error', 'Unknown')[:80]
@@ -349,8 +372,7 @@ def main():
         time.sleep(0.5)
     
     # Save vulnerability report
-    with open("vulnerability_report.json", "w") as f:
-        json.dump(vulnerability_report, f, indent=2)
+    dump_json(vulnerability_report, "vulnerability_report.json")
     
     print()
     print(f"✓ Vulnerability analysis complete")
@@ -380,7 +402,7 @@ def main():
     print(f"   🟢 Low Severity: {total_low}")
     print()
     print("📁 Generated Reports:")
-    print("   • similarity_report.json - Similarity analysis of all contract pairs")
+    print(f"   • similarity_report.json - Contract pairs ≥{SIMILARITY_STORE_THRESHOLD:.0%} similar")
     print("   • vulnerability_report.json - Slither vulnerability analysis results")
     print("   • unavailable_contracts.txt - Contracts without source code")
     print("   • retrieved_contracts/ - All contract source files (.sol)")
@@ -395,6 +417,8 @@ def main():
         "unavailable_contracts": len(unavailable),
         "similarity_analysis": {
             "total_pairs_analyzed": total_pairs,
+            "pairs_stored": len(similarity_report),
+            "store_threshold": SIMILARITY_STORE_THRESHOLD,
             "high_risk_clone_pairs": len(high_risk_pairs)
         },
         "vulnerability_analysis": {
@@ -409,8 +433,7 @@ def main():
         }
     }
     
-    with open("ANALYSIS_SUMMARY.json", "w") as f:
-        json.dump(summary, f, indent=2)
+    dump_json(summary, "ANALYSIS_SUMMARY.json")
     
     print("📊 Quick summary saved to: ANALYSIS_SUMMARY.json")
     print("="*80)
@@ -3,25 +3,65 @@ Slither vulnerability analysis for first 10 NFT contracts.
 Fetches contracts from Etherscan and runs Slither analysis.
 """
 
-import json
+import argparse
+import asyncio
+import functools
 import os
+import shutil
 import subprocess
-import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import List, Optional
+import slither_worker
 from etherscan_client import EtherscanClient
+from json_io import dump_json, load_config, load_json
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
+# Resolved once so neither the probe nor each analysis searches PATH again
+_SLITHER_PATH = shutil.which('slither')
+
+PRETTY_OUTPUT_FILE = "slither_first10_report.pretty.json"
+
+_SEVERITY_EMOJI = {'High': '🔴', 'Medium': '🟡', 'Low': '🟢', 'Informational': 'ℹ️', 'Optimization': '⚡'}
+# Every report lists all severities, in this order, even when zero
+SEVERITY_LEVELS = ('High', 'Medium', 'Low', 'Informational', 'Optimization')
+
+
+if msgspec is not None:
+    # Typed view of Slither's --json output: only the fields we report are decoded,
+    # the bulky per-finding source mappings are skipped instead of built as dicts
+    class Finding(msgspec.Struct):
+        impact: str = 'Unknown'
+        check: str = 'unknown'
+        description: str = 'No description'
+
+    class SlitherResults(msgspec.Struct):
+        detectors: List[Finding] = msgspec.field(default_factory=list)
+
+    class SlitherOutput(msgspec.Struct):
+        success: bool = False
+        error: Optional[str] = 'Unknown error'
+        results: SlitherResults = msgspec.field(default_factory=SlitherResults)
+
+
+@functools.lru_cache(maxsize=1)
 def check_slither():
-    """Check if Slither is installed."""
+    """Check if Slither is installed (probed once per process)."""
     try:
-        result = subprocess.run(['slither', '--version'], 
-                              capture_output=True, 
-                              text=True, 
-                              timeout=5)
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            print(f"✓ Slither found: {version}\n")
-            return True
+        if _SLITHER_PATH is not None:
+            result = subprocess.run([_SLITHER_PATH, '--version'], 
+                                  capture_output=True, 
+                                  text=True, 
+                                  timeout=5)
+            if result.returncode == 0:
+                version = result.stdout.strip()
+                print(f"✓ Slither found: {version}\n")
+                return True
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
     
@@ -34,78 +74,99 @@ def save_contract_file(address, source_code, output_dir="retrieved_contracts"):
     Path(output_dir).mkdir(exist_ok=True)
     
     filepath = os.path.join(output_dir, f"{address}.sol")
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(source_code)
+    with open(filepath, 'wb') as f:
+        f.write(source_code.encode('utf-8'))
     
     return filepath
 
 
+def _issues(detectors):
+    """Report issues from Slither's detector dicts."""
+    return [
+        {
+            'severity': detector.get('impact', 'Unknown'),
+            'type': detector.get('check', 'unknown'),
+            'description': detector.get('description', 'No description')
+        }
+        for detector in detectors
+    ]
+
+
+def _read_slither_json(path):
+    """(success, error, issues) from a Slither --json output file."""
+    if msgspec is not None:
+        try:
+            output = msgspec.json.decode(Path(path).read_bytes(), type=SlitherOutput)
+        except msgspec.ValidationError:
+            pass  # Unexpected shape; fall back to the untyped parse
+        else:
+            issues = [
+                {'severity': f.impact, 'type': f.check, 'description': f.description}
+                for f in output.results.detectors
+            ]
+            return output.success, output.error, issues
+    data = load_json(path)
+    return data.get('success'), data.get('error', 'Unknown error'), _issues(data.get('results', {}).get('detectors', []))
+
+
+def _detector_result(address, issues):
+    """Build a successful result from the issues Slither found."""
+    counts = Counter(issue['severity'] for issue in issues)
+    severity_counts = {sev: counts[sev] for sev in SEVERITY_LEVELS}
+    
+    return {
+        'success': True,
+        'address': address,
+        'issues': issues,
+        'issue_count': len(issues),
+        'severity_breakdown': severity_counts
+    }
+
+
 def analyze_with_slither(contract_file, address):
     """
     Analyze a Solidity contract with Slither.
     Returns analysis results dictionary.
+    Runs in a worker process, so progress is printed by the caller.
+    Uses the persistent slither_worker when available, else the slither CLI.
     """
     try:
-        print(f"  Running Slither analysis...")
+        response = slither_worker.analyze(contract_file, timeout=60)
+        if response is not None:
+            if response['success']:
+                return _detector_result(address, _issues(response['detectors']))
+            return {
+                'success': False,
+                'address': address,
+                'error': response.get('error', 'Unknown error'),
+                'issues': [],
+                'issue_count': 0
+            }
         
         # Save output to a temp JSON file (more reliable than stdout)
         temp_json = f"temp_slither_{address}.json"
         
-        cmd = ['slither', contract_file, '--json', temp_json, '--solc-disable-warnings']
+        cmd = [_SLITHER_PATH or 'slither', contract_file, '--json', temp_json, '--solc-disable-warnings']
         
+        # Findings come from the JSON file; only stderr is kept, for the error message
         result = subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=60
         )
         
         # Read the JSON output file
         if os.path.exists(temp_json):
-            with open(temp_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            success, error, issues = _read_slither_json(temp_json)
             
             # Clean up temp file
             os.remove(temp_json)
             
             # Parse Slither results
-            if data.get('success'):
-                detectors = data.get('results', {}).get('detectors', [])
-                
-                issues = []
-                severity_counts = {'High': 0, 'Medium': 0, 'Low': 0, 'Informational': 0, 'Optimization': 0}
-                
-                for detector in detectors:
-                    impact = detector.get('impact', 'Unknown')
-                    check = detector.get('check', 'unknown')
-                    description = detector.get('description', 'No description')
-                    
-                    issues.append({
-                        'severity': impact,
-                        'type': check,
-                        'description': description
-                    })
-                    
-                    if impact in severity_counts:
-                        severity_counts[impact] += 1
-                
-                print(f"  ✓ Found {len(issues)} issues")
-                if len(issues) > 0:
-                    for sev, count in severity_counts.items():
-                        if count > 0:
-                            emoji = {'High': '🔴', 'Medium': '🟡', 'Low': '🟢', 
-                                    'Informational': 'ℹ️', 'Optimization': '⚡'}.get(sev, '•')
-                            print(f"    {emoji} {sev}: {count}")
-                
-                return {
-                    'success': True,
-                    'address': address,
-                    'issues': issues,
-                    'issue_count': len(issues),
-                    'severity_breakdown': severity_counts
-                }
+            if success:
+                return _detector_result(address, issues)
             else:
-                error = data.get('error', 'Unknown error')
                 return {
                     'success': False,
                     'address': address,
@@ -115,7 +176,7 @@ def analyze_with_slither(contract_file, address):
                 }
         else:
             # No JSON file created - check stderr
-            error_msg = result.stderr[:500] if result.stderr else 'Slither did not produce output file'
+            error_msg = result.stderr[:500].decode('utf-8', 'replace') if result.stderr else 'Slither did not produce output file'
             return {
                 'success': False,
                 'address': address,
@@ -124,7 +185,7 @@ def analyze_with_slither(contract_file, address):
                 'issue_count': 0
             }
             
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, slither_worker.WorkerTimeout):
         return {
             'success': False,
             'address': address,
@@ -142,8 +203,82 @@ def analyze_with_slither(contract_file, address):
         }
 
 
-def main():
+def print_result(address, result):
+    """Print the outcome of one contract's analysis."""
+    print(f"\n{address}")
+    if result['success']:
+        issues = result['issue_count']
+        print(f"  ✓ Found {issues} issues")
+        if issues > 0:
+            for sev, count in result['severity_breakdown'].items():
+                if count > 0:
+                    print(f"    {_SEVERITY_EMOJI.get(sev, '•')} {sev}: {count}")
+    elif result.get('error') == 'Source code not available':
+        print(f"  ✗ Source code unavailable")
+    else:
+        print(f"  ✗ Error: {result.get('error', 'Unknown')[:100]}")
+
+
+async def analyze_contracts(addresses, api_key):
+    """
+    Fetch and analyze contracts concurrently.
+    
+    Fetches run in threads, at most 5 in flight; EtherscanClient's token
+    bucket keeps them under the 5 req/s limit. Every fetched source goes through a
+    queue to a process pool running one Slither per CPU, so analysis of early
+    contracts overlaps with fetching the rest.
+    
+    Returns:
+        {address: result}, in completion order
+    """
+    loop = asyncio.get_running_loop()
+    etherscan = EtherscanClient(api_key)
+    semaphore = asyncio.Semaphore(5)
+    fetched = asyncio.Queue()
+    
+    async def fetch(address):
+        async with semaphore:
+            source_code = await loop.run_in_executor(None, etherscan.get_contract_source, address)
+        await fetched.put((address, source_code))
+    
+    async def analyze(pool, address, source_code):
+        if not source_code:
+            return address, {
+                'success': False,
+                'error': 'Source code not available',
+                'issues': [],
+                'issue_count': 0
+            }
+        contract_file = save_contract_file(address, source_code)
+        return address, await loop.run_in_executor(pool, analyze_with_slither, contract_file, address)
+    
+    results = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        producers = [asyncio.create_task(fetch(address)) for address in addresses]
+        analyses = []
+        for _ in addresses:
+            address, source_code = await fetched.get()
+            if source_code:
+                print(f"  ✓ Retrieved {address} ({len(source_code)} chars)")
+            analyses.append(asyncio.create_task(analyze(pool, address, source_code)))
+        await asyncio.gather(*producers)
+        
+        for done, next_result in enumerate(asyncio.as_completed(analyses), 1):
+            address, result = await next_result
+            results[address] = result
+            print(f"[{done}/{len(addresses)}]", end="")
+            print_result(address, result)
+    
+    return results
+
+
+def main(argv=None):
     """Main analysis workflow."""
+    parser = argparse.ArgumentParser(description="Slither analysis of the first 10 contracts in contracts.txt")
+    parser.add_argument("--pretty", action="store_true",
+                        help="Also write an indented copy of the report for reading")
+    args = parser.parse_args(argv)
+    
     print("="*70)
     print("SLITHER VULNERABILITY ANALYSIS - FIRST 10 CONTRACTS")
     print("="*70)
@@ -155,8 +290,7 @@ def main():
     
     # Load Etherscan API key from config.json
     try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
+        config = load_config()
         api_key = config.get('etherscan_api_key') or os.environ.get('ETHERSCAN_API_KEY')
         if not api_key:
             print("✗ No API key found in config.json or ETHERSCAN_API_KEY env var")
@@ -180,53 +314,15 @@ def main():
     print(f"Analyzing first {sample_size} contracts from contracts.txt")
     print(f"{'='*70}\n")
     
-    # Initialize Etherscan client
-    etherscan = EtherscanClient(api_key)
-    
-    results = {}
-    successful = 0
-    failed = 0
-    unavailable = 0
-    total_issues = 0
+    results = asyncio.run(analyze_contracts(addresses, api_key))
+    # Report contracts in contracts.txt order, not completion order
+    results = {address: results[address] for address in addresses if address in results}
     
-    for idx, address in enumerate(addresses, 1):
-        print(f"[{idx}/{sample_size}] Contract: {address}")
-        
-        # Fetch contract source
-        print(f"  Fetching source code...")
-        source_code = etherscan.get_contract_source(address)
-        
-        if not source_code:
-            print(f"  ✗ Source code unavailable\n")
-            results[address] = {
-                'success': False,
-                'error': 'Source code not available',
-                'issues': [],
-                'issue_count': 0
-            }
-            unavailable += 1
-            time.sleep(0.25)  # Rate limiting
-            continue
-        
-        print(f"  ✓ Retrieved ({len(source_code)} chars)")
-        
-        # Save contract to file
-        contract_file = save_contract_file(address, source_code)
-        print(f"  ✓ Saved to {contract_file}")
-        
-        # Run Slither analysis
-        result = analyze_with_slither(contract_file, address)
-        results[address] = result
-        
-        if result['success']:
-            successful += 1
-            total_issues += result['issue_count']
-        else:
-            failed += 1
-            print(f"  ✗ Error: {result.get('error', 'Unknown')[:100]}")
-        
-        print()
-        time.sleep(0.25)  # Rate limiting
+    successful = sum(1 for r in results.values() if r['success'])
+    unavailable = sum(1 for r in results.values() if r.get('error') == 'Source code not available')
+    failed = len(results) - successful - unavailable
+    total_issues = sum(r['issue_count'] for r in results.values() if r['success'])
+    print()
     
     # Save results
     output_file = "slither_first10_report.json"
@@ -239,8 +335,10 @@ def main():
         'contracts': results
     }
     
-    with open(output_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    # Compact by default; the indented copy is only for humans
+    dump_json(report, output_file, indent=False)
+    if args.pretty:
+        dump_json(report, PRETTY_OUTPUT_FILE)
     
     # Print summary
     print("="*70)
@@ -252,6 +350,8 @@ def main():
     print(f"  ⚠ Unavailable: {unavailable}")
     print(f"  📋 Total issues found: {total_issues}")
     print(f"\nDetailed results saved to: {output_file}")
+    if args.pretty:
+        print(f"Readable copy saved to: {PRETTY_OUTPUT_FILE}")
     print("="*70)
 
 
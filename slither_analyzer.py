@@ -1,3 +1,6 @@
+import hashlib
+import io
+import itertools
 import subprocess
 import tempfile
 import os
@@ -5,132 +8,396 @@ import sys
 import json
 import re
 import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import slither_worker
+from json_io import dump_json, load_json, loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Resolved once: slither on PATH, else the one installed next to this Python (project venv)
+_SLITHER_PATH = shutil.which("slither") or shutil.which("slither", path=os.path.dirname(sys.executable))
+_SOLC_SELECT_PATH = shutil.which("solc-select") or shutil.which("solc-select", path=os.path.dirname(sys.executable))
+
+# solc versions already installed through solc-select, kept across runs
+_SOLC_INSTALLED_FILE = Path(".solc_installed.json")
+try:
+    _INSTALLED_SOLCS = set(load_json(_SOLC_INSTALLED_FILE))
+except (OSError, ValueError):
+    _INSTALLED_SOLCS = set()
+
+# Single-file sources are written to tmpfs where available so the round trip stays in memory.
+# (A FIFO won't do: crytic-compile reads the source again after solc has consumed it.)
+_SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+# The pure-Python ijson backend is slower than one orjson parse, so only stream with a C backend
+_STREAM_SOURCES = ijson is not None and ijson.backend in ("yajl2_c", "yajl2_cffi")
+
+# Package directories whose files are libraries, not the contract under analysis
+LIB_PREFIXES = ('@openzeppelin/', 'node_modules/', '@chainlink/', '@uniswap/')
+_LIB_SEGMENTS = tuple('/' + prefix for prefix in LIB_PREFIXES)
+# A contract or interface declaration anywhere in a source file
+_DECL_RE = re.compile(r'\b(?:contract|interface)\s')
+# Multi-file trees extracted by _extract_all_contracts_cached, one per source hash,
+# next to the fetched-source caches
+_EXTRACT_CACHE_DIR = Path.home() / ".cache" / "nft_sim" / "extracted"
+
+# Etherscan's JSON formats are the only sources starting with '{' (after whitespace)
+_JSON_START_RE = re.compile(r'\s*\{')
+_PRAGMA_RE = re.compile(r'pragma\s+solidity\s+([^;]+);')
+_SEMVER_RE = re.compile(r'(\d+\.\d+)')
+# An exact version pragma: "0.8.17" or "=0.8.17"
+_EXACT_VERSION_RE = re.compile(r'=?\s*(\d+\.\d+\.\d+)')
+
+# Every result lists all severities, in this order, even when zero
+SEVERITY_LEVELS = ('High', 'Medium', 'Low', 'Informational', 'Optimization')
+
+
+def _detector_result(output, detectors):
+    """Successful analysis result from Slither's detector dicts."""
+    issues = [
+        {
+            'severity': detector.get('impact', 'Unknown'),
+            'type': detector.get('check', 'unknown'),
+            'description': detector.get('description', 'No description')
+        }
+        for detector in detectors
+    ]
+    counts = Counter(issue['severity'] for issue in issues)
+    return {
+        'success': True,
+        'output': output,
+        'issues': issues,
+        'issue_count': len(issues),
+        'severity_breakdown': {sev: counts[sev] for sev in SEVERITY_LEVELS}
+    }
+
+
+def _failed_result(output, error):
+    """Failed analysis result; output keeps Slither's text for diagnostics."""
+    return {'success': False, 'output': output, 'error': error}
+
+
+def report_output(entry):
+    """
+    Slither's text output for a vulnerability_report.json entry: the entry itself
+    in old text-only reports, else the text kept in its slither result.
+    """
+    if isinstance(entry, str):
+        return entry
+    slither = entry.get('analyzers', {}).get('slither', entry)
+    return slither.get('output', '')
+
+
+def is_library(path):
+    """
+    True if path lies in a library package directory, at the root (Etherscan's
+    "@openzeppelin/...") or nested ("lib/@openzeppelin/...", Truffle's absolute
+    "/home/x/project/node_modules/..."). Accepts / or \\ separators, any case.
+    """
+    # Normalised with a leading "/" so root and nested package dirs match alike
+    normalized = '/' + path.replace('\\', '/').lstrip('/').lower()
+    return any(segment in normalized for segment in _LIB_SEGMENTS)
+
 
 class SlitherAnalyzer:
     @staticmethod
-    def _extract_all_contracts(code):
+    def _write_file(file_path, content):
+        """Write one extracted source file."""
+        # Keep original path separators (forward slashes) for solc compatibility;
+        # Python on Windows accepts forward slashes
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    @staticmethod
+    def _source_priority(filename, content):
+        """Main-file priority of a source that defines a contract/interface, else None."""
+        if _DECL_RE.search(content) is None:
+            return None
+        # Prioritize non-library files
+        library = is_library(filename)
+        is_in_contracts = 'contracts/' in filename or 'contracts\\' in filename
+        # Priority: non-library gets huge bonus (100000), then contracts/, then size
+        return (not library) * 100000 + is_in_contracts * 10000 + len(content)
+
+    @staticmethod
+    def _write_sources(entries, out_dir=None):
+        """
+        Write (filename, content) entries into out_dir, or a new temp directory, and pick
+        the main file. Entries may be a stream: each content is written and scored as it
+        arrives, and only the best candidate's text is kept.
+        Returns: (main_file_path, temp_dir, candidates, main_content)
+        """
+        temp_dir = out_dir or tempfile.mkdtemp(prefix="slither_contracts_")
+        
+        # Find the main contract file
+        # Priority: 
+        # 1. Files in contracts/ directory
+        # 2. Files NOT in @openzeppelin or node_modules
+        # 3. Largest file with "contract" keyword
+        contract_candidates = []
+        best = None  # (priority, file_path, content)
+        first = None  # (file_path, content), used when no file declares a contract
+        created_dirs = set()
+        writes = []
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                for filename, content in entries:
+                    file_path = os.path.join(temp_dir, filename.lstrip('/'))
+                    parent = os.path.dirname(file_path)
+                    if parent not in created_dirs:
+                        os.makedirs(parent, exist_ok=True)
+                        created_dirs.add(parent)
+                    # Writes overlap on the pool while the next entry is parsed and scored
+                    writes.append(pool.submit(SlitherAnalyzer._write_file, file_path, content))
+                
+                    if first is None:
+                        first = (file_path, content)
+                    priority = SlitherAnalyzer._source_priority(filename, content)
+                    if priority is not None:
+                        contract_candidates.append((priority, file_path, len(content)))
+                        # Strictly greater: on ties the earliest file wins, as with a stable sort
+                        if best is None or priority > best[0]:
+                            best = (priority, file_path, content)
+            for write in writes:
+                write.result()  # Re-raise any write error
+        except BaseException:
+            # A stream that fails part-way leaves no half-written tree behind
+            # (a caller-supplied out_dir is the caller's to clean up)
+            if out_dir is None:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        
+        # Select highest priority contract
+        contract_candidates.sort(reverse=True, key=lambda x: x[0])
+        if best is not None:
+            main_file, main_content = best[1], best[2]
+        else:
+            # No contract found, use first file
+            main_file, main_content = first
+        
+        return main_file, temp_dir, contract_candidates[:5], main_content
+
+    @staticmethod
+    def _extract_streamed(raw, out_dir=None):
+        """
+        Multi-file extraction parsing only the "sources" object, one file at a time,
+        so the full dict of sources is never built.
+        Returns the _extract_all_contracts tuple, or None if raw has no non-empty
+        "sources" (the caller then does a full parse).
+        """
+        entries = (
+            (filename, file_data.get("content", ""))
+            for filename, file_data in ijson.kvitems(io.BytesIO(raw), "sources")
+        )
+        try:
+            head = next(entries, None)
+            if head is None:
+                return None
+            main_file, temp_dir, candidates, main_content = SlitherAnalyzer._write_sources(
+                itertools.chain([head], entries), out_dir
+            )
+        except ijson.JSONError:
+            return None  # Let the full parse decide (it reports invalid JSON as plain code)
+        return main_file, True, temp_dir, candidates, main_content
+
+    @staticmethod
+    def _extract_all_contracts(code, out_dir=None):
         """
         Extract ALL contracts from Etherscan's response.
-        Returns: (main_file_path, is_multi_file, temp_dir)
+        Returns: (main_file_path, is_multi_file, temp_dir, candidates, main_content)
         - For single files: returns the .sol file path
         - For multi-file: returns the main contract file path and temp directory with all files
+          (out_dir when given, e.g. a tempfile.TemporaryDirectory the caller cleans up)
+        - candidates: top 5 (priority, file_path, size) main-file candidates, best first
+          (empty for single files)
+        - main_content: source text of the main file, so callers needn't read it back
         """
-        stripped = code.strip()
-        
-        # Check if it's JSON wrapped (starts with { or {{)
-        if not stripped.startswith('{'):
+        # Check if it's JSON wrapped (starts with { or {{), without copying the source
+        if _JSON_START_RE.match(code) is None:
             # Plain Solidity code - single file
-            return code, False, None
+            return code, False, None, [], code
         
         try:
-            # Parse JSON
-            if stripped.startswith('{{'):
-                stripped = stripped[1:-1]
+            # Parse JSON; drop the {{...}} wrapper through a memoryview, not a string copy
+            raw = code.strip().encode('utf-8')
+            if raw.startswith(b'{{'):
+                raw = memoryview(raw)[1:-1]
+            
+            # Stream the sources straight to disk when a C-backed ijson is available
+            if _STREAM_SOURCES:
+                streamed = SlitherAnalyzer._extract_streamed(raw, out_dir)
+                if streamed is not None:
+                    return streamed
             
-            data = json.loads(stripped)
+            data = loads(raw)
             
             # Check if it has "sources" (multi-file format)
             if "sources" not in data:
                 # Try to find single file content
                 for key, value in data.items():
                     if isinstance(value, dict) and "content" in value:
-                        return value["content"], False, None
-                return code, False, None
+                        return value["content"], False, None, [], value["content"]
+                return code, False, None, [], code
             
             sources = data["sources"]
             if not sources:
-                return code, False, None
+                return code, False, None, [], code
             
             # Multi-file contract - create temp directory structure
-            temp_dir = tempfile.mkdtemp(prefix="slither_contracts_")
-            
-            # Find the main contract file
-            # Priority: 
-            # 1. Files in contracts/ directory
-            # 2. Files NOT in @openzeppelin or node_modules
-            # 3. Largest file with "contract" keyword
-            main_file = None
-            max_size = 0
-            contract_candidates = []
-            
-            for filename, file_data in sources.items():
-                content = file_data.get("content", "")
-                
-                # Keep original path separators (forward slashes) for solc compatibility
-                # Just remove leading slash
-                clean_filename = filename.lstrip('/')
-                
-                # Create file in temp directory (Python on Windows accepts forward slashes)
-                file_path = os.path.join(temp_dir, clean_filename)
-                # Normalize the directory path for os.makedirs
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
-                # Track contract candidates
-                if "contract " in content or "interface " in content:
-                    # Prioritize non-library files
-                    is_library = any(lib in filename.lower() for lib in ['@openzeppelin', 'node_modules', '@chainlink'])
-                    is_in_contracts = 'contracts/' in filename or 'contracts\\' in filename
-                    # Priority: non-library gets huge bonus (100000), then contracts/, then size
-                    priority = (not is_library) * 100000 + is_in_contracts * 10000 + len(content)
-                    contract_candidates.append((priority, file_path, len(content)))
-            
-            # Select highest priority contract
-            if contract_candidates:
-                contract_candidates.sort(reverse=True, key=lambda x: x[0])
-                main_file = contract_candidates[0][1]
-            
-            if not main_file:
-                # No contract found, use first file
-                first_filename = next(iter(sources.keys())).lstrip('/')
-                main_file = os.path.join(temp_dir, first_filename)
-            
-            return main_file, True, temp_dir
+            main_file, temp_dir, candidates, main_content = SlitherAnalyzer._write_sources(
+                ((filename, file_data.get("content", "")) for filename, file_data in sources.items()),
+                out_dir
+            )
+            return main_file, True, temp_dir, candidates, main_content
             
         except json.JSONDecodeError:
             # Not valid JSON, return as plain code
-            return code, False, None
+            return code, False, None, [], code
+    
+    @staticmethod
+    def _extract_all_contracts_cached(code):
+        """
+        _extract_all_contracts memoized on disk by a hash of the source, so running a
+        script again on the same source skips the parse and the file writes.
+        Multi-file trees live under _EXTRACT_CACHE_DIR and are shared between runs:
+        callers must not modify or delete them.
+        """
+        if _JSON_START_RE.match(code) is None:
+            return SlitherAnalyzer._extract_all_contracts(code)
+        
+        key = hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+        tree = _EXTRACT_CACHE_DIR / key
+        meta_file = _EXTRACT_CACHE_DIR / f"{key}.json"
+        
+        def resolve(meta):
+            candidates = [(priority, str(tree / relative), size) for priority, relative, size in meta["candidates"]]
+            return str(tree / meta["main_file"]), True, str(tree), candidates, meta["main_content"]
+        
+        try:
+            if tree.is_dir():
+                return resolve(load_json(meta_file))
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        # Extract into a staging directory and rename it into place, so a tree under
+        # its final name is always complete
+        _EXTRACT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f"{key}.", dir=_EXTRACT_CACHE_DIR)
+        try:
+            result = SlitherAnalyzer._extract_all_contracts(code, out_dir=staging)
+            main_file, is_multi, _, candidates, main_content = result
+            if not is_multi:
+                shutil.rmtree(staging, ignore_errors=True)
+                return result
+            prefix = len(staging) + len(os.sep)
+            meta = {
+                "main_file": main_file[prefix:],
+                "candidates": [[priority, path[prefix:], size] for priority, path, size in candidates],
+                "main_content": main_content,
+            }
+            try:
+                os.rename(staging, tree)
+            except OSError:
+                # Another run cached the same source first; its tree is identical
+                shutil.rmtree(staging, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        
+        tmp_file = meta_file.with_suffix(f".{os.getpid()}.tmp")
+        dump_json(meta, tmp_file, indent=False)
+        os.replace(tmp_file, meta_file)
+        return resolve(meta)
     
     @staticmethod
     def _extract_solc_version(code):
         """Extract required Solidity version from pragma statement."""
         # Match: pragma solidity ^0.8.0; or pragma solidity >=0.6.0 <0.8.0;
-        match = re.search(r'pragma\s+solidity\s+([^;]+);', code)
+        match = _PRAGMA_RE.search(code)
         if match:
             version_spec = match.group(1).strip()
             # Extract base version (e.g., "^0.8.0" -> "0.8", ">=0.7.0" -> "0.7")
-            version_match = re.search(r'(\d+\.\d+)', version_spec)
+            version_match = _SEMVER_RE.search(version_spec)
             if version_match:
                 return version_match.group(1)
         return None
 
+    @staticmethod
+    def _pinned_solc_version(code):
+        """
+        Compiler version to pin, only when every pragma in code names the same exact
+        version ("0.8.17" / "=0.8.17"). Ranges and carets (^0.8.0, >=0.6.0 <0.9.0)
+        return None: their lowest version may be too old for imported files, so
+        solc-select is left to pick a compatible compiler.
+        """
+        pinned = None
+        for match in _PRAGMA_RE.finditer(code):
+            exact = _EXACT_VERSION_RE.fullmatch(match.group(1).strip())
+            if exact is None or (pinned is not None and exact.group(1) != pinned):
+                return None
+            pinned = exact.group(1)
+        return pinned
+
+    @staticmethod
+    def _ensure_solc(version):
+        """
+        Install solc `version` with solc-select unless it is already known to be installed.
+        Returns True if the version can be used.
+        """
+        if version in _INSTALLED_SOLCS:
+            return True
+        if _SOLC_SELECT_PATH is None:
+            return False
+        try:
+            result = subprocess.run([_SOLC_SELECT_PATH, "install", version],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=120)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        if result.returncode != 0:
+            return False
+        _INSTALLED_SOLCS.add(version)
+        dump_json(sorted(_INSTALLED_SOLCS), _SOLC_INSTALLED_FILE)
+        return True
+
     @staticmethod
     def analyze(code):
+        """Slither's text output for code (diagnostics included on failure)."""
+        return SlitherAnalyzer.analyze_result(code)["output"]
+
+    @staticmethod
+    def analyze_result(code):
+        """
+        Analyze code with Slither.
+        Returns {"success", "output", "issues", "issue_count", "severity_breakdown"},
+        or {"success": False, "output", "error"} if Slither could not run or compile it.
+        """
         # Preprocess: Extract contracts from JSON if needed
-        processed_input, is_multi_file, temp_dir = SlitherAnalyzer._extract_all_contracts(code)
+        processed_input, is_multi_file, temp_dir, _, main_content = SlitherAnalyzer._extract_all_contracts(code)
         
         # Detect required Solidity version
-        if is_multi_file:
-            # Read main file to get version
-            with open(processed_input, 'r', encoding='utf-8') as f:
-                main_content = f.read()
-            required_version = SlitherAnalyzer._extract_solc_version(main_content)
-        else:
-            required_version = SlitherAnalyzer._extract_solc_version(processed_input)
+        required_version = SlitherAnalyzer._extract_solc_version(main_content)
         
         version_warning = ""
         if required_version:
             version_warning = f"[INFO] Contract requires Solidity {required_version}\n"
         
+        # Compile with a matching solc; solc-select reads SOLC_VERSION from the environment
+        solc_version = SlitherAnalyzer._pinned_solc_version(main_content)
+        if solc_version and not SlitherAnalyzer._ensure_solc(solc_version):
+            solc_version = None
+        
         # For single file, create temp file
         temp_file_path = None
         if not is_multi_file:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".sol", mode="w", encoding="utf-8") as f:
-                f.write(processed_input)
-                f.flush()
-                temp_file_path = f.name
+            fd, temp_file_path = tempfile.mkstemp(suffix=".sol", prefix="slither_", dir=_SCRATCH_DIR)
+            with os.fdopen(fd, "wb") as f:
+                f.write(processed_input.encode("utf-8"))
             target_path = temp_file_path
         else:
             # For multi-file, use the main contract path
@@ -140,50 +407,54 @@ class SlitherAnalyzer:
             # Convert paths to forward slashes for solc (Windows compatibility)
             target_path_normalized = target_path.replace('\\', '/')
             
-            # Build Slither command
-            cmd = ["slither", target_path_normalized]
-            
             # Add solc args for both multi-file and single-file (Windows path fix)
             if is_multi_file and temp_dir:
                 temp_dir_normalized = temp_dir.replace('\\', '/')
-                cmd.append("--solc-args")
-                cmd.append(f"--base-path {temp_dir_normalized} --allow-paths {temp_dir_normalized}")
+                solc_args = f"--base-path {temp_dir_normalized} --allow-paths {temp_dir_normalized}"
             else:
                 # For single-file, explicitly set allow-paths to fix Windows path issue
                 temp_file_dir = os.path.dirname(target_path).replace('\\', '/')
-                cmd.append("--solc-args")
-                cmd.append(f"--allow-paths {temp_file_dir}")
+                solc_args = f"--allow-paths {temp_file_dir}"
             
+            # Prefer the persistent worker; fall back to the CLI if it's unavailable
             try:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            except FileNotFoundError:
-                # Fallback: attempt to use slither from the same venv as Python
-                python_exe = sys.executable
-                scripts_dir = os.path.join(os.path.dirname(python_exe))
-                slither_exe = os.path.join(scripts_dir, "slither.exe" if os.name == "nt" else "slither")
-                
-                if is_multi_file and temp_dir:
-                    temp_dir_normalized = temp_dir.replace('\\', '/')
-                    cmd = [slither_exe, target_path_normalized, "--solc-args", f"--base-path {temp_dir_normalized} --allow-paths {temp_dir_normalized}"]
-                else:
-                    temp_file_dir = os.path.dirname(target_path).replace('\\', '/')
-                    cmd = [slither_exe, target_path_normalized, "--solc-args", f"--allow-paths {temp_file_dir}"]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+                response = slither_worker.analyze(target_path_normalized, solc_args=solc_args,
+                                                  timeout=60, solc_version=solc_version)
+            except slither_worker.WorkerTimeout:
+                return _failed_result("Slither analysis timed out.", "Slither analysis timed out.")
+            if response is not None:
+                if not response["success"]:
+                    output = version_warning + response.get("traceback", response.get("error", ""))
+                    return _failed_result(output, response.get("error", "Unknown error"))
+                lines = [d["description"] for d in response["detectors"]]
+                lines.append(f"{len(response['detectors'])} result(s) found")
+                return _detector_result(version_warning + "\n".join(lines), response["detectors"])
             
-            # Return both stdout and stderr if available for better diagnostics
-            output = version_warning
-            output += result.stdout or ""
-            if result.stderr:
-                output += ("\n" if output else "") + "[stderr]\n" + result.stderr
-            return output
+            # Build Slither command; "--json -" puts the results on stdout, the log stays on stderr
+            cmd = [_SLITHER_PATH or "slither", target_path_normalized, "--solc-args", solc_args, "--json", "-"]
+            env = dict(os.environ, SOLC_VERSION=solc_version) if solc_version else None
+            result = subprocess.run(cmd, capture_output=True, timeout=60, env=env)
+            
+            output = version_warning + result.stderr.decode("utf-8", "replace")
+            try:
+                data = loads(result.stdout)
+            except ValueError:
+                return _failed_result(output, "Slither produced no JSON output")
+            if not data.get("success"):
+                return _failed_result(output, data.get("error") or "Unknown error")
+            return _detector_result(output, (data.get("results") or {}).get("detectors", []))
             
         except FileNotFoundError:
-            return "Slither not found. Please install slither-analyzer and ensure 'slither' is in PATH."
+            message = "Slither not found. Please install slither-analyzer and ensure 'slither' is in PATH."
+            return _failed_result(message, message)
         except subprocess.TimeoutExpired:
-            return "Slither analysis timed out."
+            return _failed_result("Slither analysis timed out.", "Slither analysis timed out.")
         finally:
             # Cleanup
-            if temp_file_path and os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
+            if temp_file_path:
+                try:
+                    os.unlink(temp_file_path)
+                except FileNotFoundError:
+                    pass
             if temp_dir and os.path.exists(temp_dir):
                 shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,163 @@
+"""
+Long-lived Slither worker.
+
+Run as a script, it imports Slither once and then analyzes one contract per
+JSON line read from stdin ({"path": ..., "solc_args": ...}), answering with
+one JSON line per request on stdout. Importing the module gives the client
+side: analyze() sends a request to a worker started on first use, so the
+interpreter and Slither import cost is paid once per process instead of once
+per contract. Callers fall back to the `slither` CLI when it returns None.
+"""
+
+import atexit
+import inspect
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import traceback
+
+
+class WorkerTimeout(Exception):
+    """The worker did not answer in time (it has been killed)."""
+
+
+_lock = threading.Lock()
+_proc = None
+_responses = None
+_unavailable = False
+
+
+def _reader(proc, responses):
+    """Forward worker stdout lines to a queue; None marks worker exit."""
+    for line in proc.stdout:
+        responses.put(line)
+    responses.put(None)
+
+
+def _start():
+    """Spawn the worker and wait for its ready line; None if Slither can't be imported."""
+    global _proc, _responses
+    proc = subprocess.Popen(
+        [sys.executable, __file__],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        bufsize=1
+    )
+    responses = queue.Queue()
+    threading.Thread(target=_reader, args=(proc, responses), daemon=True).start()
+    try:
+        ready = responses.get(timeout=60)
+    except queue.Empty:
+        ready = None
+    if not ready:
+        proc.kill()
+        return None
+    _proc, _responses = proc, responses
+    return proc
+
+
+def _stop():
+    global _proc, _responses
+    if _proc is not None:
+        _proc.kill()
+        _proc.wait()
+    _proc = _responses = None
+
+
+atexit.register(_stop)
+
+
+def analyze(path, solc_args=None, timeout=60, solc_version=None):
+    """
+    Analyze one contract in the persistent worker.
+    solc_version, if given, is exported as SOLC_VERSION for solc-select.
+
+    Returns:
+        {"success": True, "detectors": [...]} or {"success": False, "error": ...};
+        None if the worker is unavailable or crashed (use the CLI instead).
+    Raises:
+        WorkerTimeout if the analysis exceeded `timeout` seconds.
+    """
+    global _unavailable
+    with _lock:
+        if _unavailable:
+            return None
+        if (_proc is None or _proc.poll() is not None) and _start() is None:
+            _unavailable = True
+            return None
+        try:
+            request = {"path": str(path), "solc_args": solc_args, "solc_version": solc_version}
+            _proc.stdin.write(json.dumps(request) + "\n")
+            _proc.stdin.flush()
+            line = _responses.get(timeout=timeout)
+        except OSError:
+            line = None
+        except queue.Empty:
+            _stop()
+            raise WorkerTimeout(f"Analysis timeout ({timeout}s)")
+        if not line:
+            # Worker died mid-request; the next call starts a fresh one
+            _stop()
+            return None
+        return json.loads(line)
+
+
+def _load_detectors():
+    from slither.detectors import all_detectors
+    from slither.detectors.abstract_detector import AbstractDetector
+    return [
+        d for d in vars(all_detectors).values()
+        if inspect.isclass(d) and issubclass(d, AbstractDetector)
+    ]
+
+
+def _serve():
+    """Worker loop: one request line in, one response line out."""
+    # Keep stdout for the protocol; anything Slither or solc prints goes to stderr
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    from slither import Slither
+    detectors = _load_detectors()
+    out.write(json.dumps({"ready": True}) + "\n")
+    out.flush()
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        if request.get("solc_version"):
+            os.environ["SOLC_VERSION"] = request["solc_version"]
+        else:
+            os.environ.pop("SOLC_VERSION", None)
+        try:
+            kwargs = {"solc_args": request["solc_args"]} if request.get("solc_args") else {}
+            slither = Slither(request["path"], **kwargs)
+            for detector in detectors:
+                slither.register_detector(detector)
+            found = [
+                {
+                    "check": finding.get("check"),
+                    "impact": finding.get("impact"),
+                    "confidence": finding.get("confidence"),
+                    "description": finding.get("description")
+                }
+                for findings in slither.run_detectors()
+                for finding in findings
+            ]
+            response = {"success": True, "detectors": found}
+        except Exception as e:
+            response = {
+                "success": False,
+                "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc()
+            }
+        out.write(json.dumps(response) + "\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    _serve()
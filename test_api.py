@@ -1,10 +1,9 @@
 import requests
-import json
+from json_io import dumps, load_config
 
 
 # Load the API key from config
-with open("config.json") as f:
-    config = json.load(f)
+config = load_config()
 
 api_key = config["etherscan_api_key"]
 
@@ -25,7 +24,8 @@ params = {
 }
 
 try:
-    response = requests.get("https://api.etherscan.io/v2/api", params=params, timeout=20)
+    with requests.Session() as session:
+        response = session.get("https://api.etherscan.io/v2/api", params=params, timeout=20)
     response.raise_for_status()
     data = response.json()
     
@@ -43,7 +43,7 @@ try:
         print(f"First 200 chars of source:\n{source_code[:200]}...")
     else:
         print(f"\n❌ API Key Issue or Contract Not Verified")
-        print(f"Full Response: {json.dumps(data, indent=2)}")
+        print(f"Full Response: {dumps(data).decode()}")
         
 except Exception as e:
     print(f"\n❌ Error: {e}")
@@ -1,32 +1,35 @@
 """Test if we can find high-risk contracts from similarity report."""
-import json
+from analyze import iter_similarity_pairs
 
-# Load similarity report
-with open('similarity_report.json') as f:
-    sim_report = json.load(f)
+THRESHOLD = 0.95
 
-# Find high similarity pairs (>= 95%)
+# Find high similarity pairs (>= 95%) in one streaming pass over the report
 high_sim_pairs = []
 contract_risk = {}
+current_risk = contract_risk.get
+total_pairs = 0
 
-for pair_key, pair_data in sim_report.items():
-    if isinstance(pair_data, dict):
-        full_sim = pair_data.get('full_similarity', 0)
-        partial_sim = pair_data.get('partial_similarity', 0)
-        
-        if full_sim >= 0.95 or partial_sim >= 0.95:
-            addr1 = pair_data.get('contract1', '')
-            addr2 = pair_data.get('contract2', '')
-            risk_score = max(full_sim, partial_sim)
-            
-            high_sim_pairs.append((addr1, addr2, full_sim * 100, partial_sim * 100))
-            
-            if addr1:
-                contract_risk[addr1] = max(contract_risk.get(addr1, 0), risk_score)
-            if addr2:
-                contract_risk[addr2] = max(contract_risk.get(addr2, 0), risk_score)
+for pair_key, pair_data in iter_similarity_pairs('similarity_report.json'):
+    total_pairs += 1
+    if not isinstance(pair_data, dict):
+        continue
+    
+    full_sim = pair_data.get('full_similarity', 0)
+    partial_sim = pair_data.get('partial_similarity', 0)
+    risk_score = full_sim if full_sim > partial_sim else partial_sim
+    if risk_score < THRESHOLD:
+        continue
+    
+    addr1 = pair_data.get('contract1', '')
+    addr2 = pair_data.get('contract2', '')
+    high_sim_pairs.append((addr1, addr2, full_sim * 100, partial_sim * 100))
+    
+    if addr1 and risk_score > current_risk(addr1, 0):
+        contract_risk[addr1] = risk_score
+    if addr2 and risk_score > current_risk(addr2, 0):
+        contract_risk[addr2] = risk_score
 
-print(f"Total pairs in report: {len(sim_report)}")
+print(f"Total pairs in report: {total_pairs}")
 print(f"High-risk pairs (>= 95%): {len(high_sim_pairs)}")
 print(f"Unique high-risk contracts: {len(contract_risk)}")
 
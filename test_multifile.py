@@ -1,14 +1,23 @@
 """Test multi-file extraction from Etherscan responses"""
-import json
 import os
-from etherscan_client import EtherscanClient
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from etherscan_client import get_client
 from slither_analyzer import SlitherAnalyzer
 
-# Load API key
-with open("config.json") as f:
-    config = json.load(f)
 
-client = EtherscanClient(config["etherscan_api_key"])
+def iter_files(path):
+    """Recursively yield DirEntry objects for files under path (stat comes with the entry)."""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir():
+                yield from iter_files(entry.path)
+            else:
+                yield entry
+
+
+client = get_client()
 
 # Test with contracts that have JSON format
 test_addresses = [
@@ -16,47 +25,45 @@ test_addresses = [
     ("0xBC4CA0EdA7647A8aB7C2061c2E118A18a936f13D", "BAYC (Flattened)"),
 ]
 
-for test_address, name in test_addresses:
+# Fetch all test contracts up front, in parallel (the client enforces the rate limit)
+with ThreadPoolExecutor(max_workers=len(test_addresses)) as pool:
+    codes = list(pool.map(client.get_contract_source, [address for address, _ in test_addresses]))
+
+for (test_address, name), code in zip(test_addresses, codes):
     print(f"\n{'='*70}")
     print(f"Testing: {name}")
     print(f"Address: {test_address}")
     print('='*70)
 
-    code = client.get_contract_source(test_address)
     if code:
         print(f"\nOriginal response length: {len(code)} chars")
         print(f"Starts with: {code[:60]}...")
         
-        # Extract all contracts
-        main_file, is_multi, temp_dir = SlitherAnalyzer._extract_all_contracts(code)
-        
-        if is_multi:
-            print(f"\n✓ Multi-file contract detected!")
-            print(f"  Temp directory: {temp_dir}")
-            print(f"  Main contract: {main_file}")
+        # Extract all contracts; the directory is removed on exit, even if interrupted
+        with tempfile.TemporaryDirectory(prefix="slither_contracts_") as out_dir:
+            main_file, is_multi, temp_dir, _, main_content = SlitherAnalyzer._extract_all_contracts(code, out_dir=out_dir)
             
-            # List all extracted files
-            if temp_dir and os.path.exists(temp_dir):
-                print(f"\n  Extracted files:")
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(file_path, temp_dir)
-                        size = os.path.getsize(file_path)
-                        print(f"    - {rel_path} ({size} bytes)")
-                
-                # Read main file
-                with open(main_file, 'r', encoding='utf-8') as f:
-                    main_content = f.read()
-                print(f"\n  Main contract starts with:")
-                print(f"  {main_content[:200]}...")
+            if is_multi:
+                print(f"\n✓ Multi-file contract detected!")
+                print(f"  Temp directory: {temp_dir}")
+                print(f"  Main contract: {main_file}")
                 
-                # Cleanup
-                import shutil
-                shutil.rmtree(temp_dir, ignore_errors=True)
-        else:
-            print(f"\n✓ Single file contract")
-            print(f"  Content starts with: {main_file[:200]}...")
+                # List all extracted files
+                if temp_dir:
+                    print(f"\n  Extracted files:")
+                    # One write for the whole listing rather than one print per file
+                    lines = []
+                    prefix = len(temp_dir) + len(os.sep)
+                    for entry in iter_files(temp_dir):
+                        rel_path = entry.path[prefix:]
+                        lines.append(f"    - {rel_path} ({entry.stat().st_size} bytes)\n")
+                    sys.stdout.write("".join(lines))
+                    
+                    print(f"\n  Main contract starts with:")
+                    print(f"  {main_content[:200]}...")
+            else:
+                print(f"\n✓ Single file contract")
+                print(f"  Content starts with: {main_file[:200]}...")
     else:
         print("Failed to fetch contract")
 
@@ -4,7 +4,7 @@ This tests the new Mythril analyzer before running full analysis.
 """
 
 from mythril_analyzer import MythrilAnalyzer
-import json
+from json_io import dump_json
 
 print("="*70)
 print("MYTHRIL INTEGRATION TEST")
@@ -47,8 +47,7 @@ if result.get("success"):
         print(f"\n✅ No vulnerabilities detected - contract appears secure!")
     
     # Save full report
-    with open('mythril_test_report.json', 'w') as f:
-        json.dump(result, f, indent=2)
+    dump_json(result, 'mythril_test_report.json')
     print(f"\n📄 Full report saved to: mythril_test_report.json")
     
 else:
@@ -1,48 +1,95 @@
 import sys
-sys.path.append('.')
-from etherscan_client import EtherscanClient
-from slither_analyzer import SlitherAnalyzer
-import json
+from etherscan_client import get_client
+from slither_analyzer import SlitherAnalyzer, is_library
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-# Load API key
-with open("config.json") as f:
-    config = json.load(f)
-
-client = EtherscanClient(config["etherscan_api_key"])
-
-# Test ONE failing contract
-addr = '0x8f496D935A356077fAA40417881826939bCD5632'  # Tendies
-code = client.get_contract_source(addr)
-
-if code:
-    # Extract
-    main_file, is_multi, temp_dir = SlitherAnalyzer._extract_all_contracts(code)
-    
-    print(f"Address: {addr}")
-    print(f"Multi-file: {is_multi}")
-    print(f"Main file: {main_file}")
-    
-    if temp_dir and os.path.exists(temp_dir):
-        print(f"\nAll files:")
-        for root, dirs, files in os.walk(temp_dir):
-            for file in files:
-                filepath = os.path.join(root, file)
-                relative = os.path.relpath(filepath, temp_dir)
-                is_main = filepath == main_file
-                marker = " ← MAIN" if is_main else ""
-                
-                # Get priority info
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    has_contract = 'contract ' in content or 'interface ' in content
-                    is_library = any(lib in relative.lower() for lib in ['@openzeppelin', 'node_modules', '@chainlink'])
-                    is_in_contracts = 'contracts' + os.sep in relative
-                    priority = (not is_library) * 1000 + is_in_contracts * 100 + len(content)
-                    
-                    if has_contract:
-                        print(f"  {relative} (priority={priority}, lib={is_library}, in_contracts={is_in_contracts}, size={len(content)}){marker}")
+DECLARATIONS = (b'contract ', b'interface ')
+# Declarations follow the pragma and imports, so they almost always sit in the first few KB
+HEAD_BYTES = 8192
+
+
+def iter_files(path):
+    """Recursively yield the Paths of files under path."""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir():
+                yield from iter_files(entry.path)
+            else:
+                yield Path(entry.path)
+
+
+def has_contract(raw):
+    """True if raw declares a contract/interface; checks the head before scanning it all."""
+    if any(raw.find(keyword, 0, HEAD_BYTES) >= 0 for keyword in DECLARATIONS):
+        return True
+    # Rest of the file, overlapping the head so a keyword cut at the boundary still matches
+    rest = HEAD_BYTES - len(b'interface ') + 1
+    return len(raw) > HEAD_BYTES and any(raw.find(keyword, rest) >= 0 for keyword in DECLARATIONS)
+
+
+def scan(path):
+    """
+    Read every file under path exactly once, concurrently (I/O bound).
+    Yields (file_path, relative_path, has_contract, size) records; only files
+    declaring a contract/interface are decoded (size is in characters for those).
+    """
+    paths = list(iter_files(path))
+    # Every path starts with path + separator, so slicing that off gives the relative path
+    prefix = len(path) + len(os.sep)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for file_path, raw in zip(paths, pool.map(Path.read_bytes, paths)):
+            declares = has_contract(raw)
+            size = len(raw.decode('utf-8')) if declares else len(raw)
+            yield file_path, str(file_path)[prefix:], declares, size
+
+
+def main():
+    """Extract the Tendies contract and list its contract files by priority."""
+    client = get_client()
+
+    # Test ONE failing contract
+    addr = '0x8f496D935A356077fAA40417881826939bCD5632'  # Tendies
+    code = client.get_contract_source(addr)
+
+    if code:
+        # Extract; cached by content hash, so re-runs reuse the tree (shared, so not deleted here)
+        main_file, is_multi, temp_dir, *_ = SlitherAnalyzer._extract_all_contracts_cached(code)
         
-        # Cleanup
-        import shutil
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        print(f"Address: {addr}")
+        print(f"Multi-file: {is_multi}")
+        print(f"Main file: {main_file}")
+        
+        if temp_dir:
+            # One read per file; the listing and the main-file pick below both use these records
+            records = list(scan(temp_dir))
+            print(f"\nAll files ({len(records)} extracted, contract/interface files listed):")
+            
+            # Only files declaring a contract/interface are listed
+            listed = [record for record in records if record[2]]
+            
+            # Score in columns, after all the I/O: one list per attribute, then one pass
+            relatives = [relative for _, relative, _, _ in listed]
+            sizes = [size for _, _, _, size in listed]
+            libraries = [is_library(relative) for relative in relatives]
+            in_contracts = ['contracts' + os.sep in relative for relative in relatives]
+            priorities = [
+                (not library) * 1000 + is_in_contracts * 100 + size
+                for library, is_in_contracts, size in zip(libraries, in_contracts, sizes)
+            ]
+            
+            # Build the listing and write it in one go rather than one print per file
+            lines = []
+            for i, (filepath, *_) in enumerate(listed):
+                marker = " ← MAIN" if str(filepath) == main_file else ""
+                lines.append(f"  {relatives[i]} (priority={priorities[i]}, lib={libraries[i]}, in_contracts={in_contracts[i]}, size={sizes[i]}){marker}\n")
+            sys.stdout.write("".join(lines))
+            
+            if priorities:
+                best = max(range(len(priorities)), key=priorities.__getitem__)
+                print(f"\nHighest priority: {relatives[best]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,18 @@ Quick test script to verify temporal feature extraction setup
 Tests with a single well-known NFT contract
 """
 
+import asyncio
 import os
 import sys
+from pathlib import Path
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+ETHERSCAN_V2_URL = 'https://api.etherscan.io/v2/api'
+
 
 def test_imports():
     """Test that all required packages are installed"""
@@ -28,10 +38,9 @@ def test_api_key():
     # Try loading from config.json first
     api_key = ''
     try:
-        import json
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-            api_key = config.get('etherscan_api_key', '')
+        from json_io import load_config
+        config = load_config()
+        api_key = config.get('etherscan_api_key', '')
         
         if api_key and api_key != 'YourApiKeyToken':
             print(f"  ✓ API key found in config.json: {api_key[:8]}...{api_key[-4:]}")
@@ -56,49 +65,87 @@ def test_contracts_file():
         print("  ✗ contracts.txt not found")
         return False
     
-    with open('contracts.txt', 'r') as f:
-        contracts = [line.strip() for line in f if line.strip()]
+    # One read of the raw bytes; only the address that gets printed is decoded
+    contracts = [line.strip() for line in Path('contracts.txt').read_bytes().splitlines() if line.strip()]
     
     print(f"  ✓ Found {len(contracts)} contract addresses")
     if contracts:
-        print(f"  First contract: {contracts[0]}")
+        print(f"  First contract: {contracts[0].decode()}")
     return True
 
+async def fetch_creations(batches, api_key, max_concurrency=4, max_age=None):
+    """
+    getcontractcreation responses for batches of up to 5 addresses, fetched
+    concurrently with at most max_concurrency requests in flight (under
+    Etherscan's 5 req/s). Answers are cached on disk for max_age seconds
+    (default a day), as with cached_get; max_age=0 always hits the network.
+    Returns one response dict per batch, in order.
+    """
+    from contract_sources import CREATION_CACHE_TTL
+    from etherscan_client import cached_get, cached_get_async, make_session
+    
+    if max_age is None:
+        max_age = CREATION_CACHE_TTL
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    def params(batch):
+        return {
+            'chainid': '1',  # Ethereum mainnet
+            'module': 'contract',
+            'action': 'getcontractcreation',
+            'contractaddresses': ','.join(batch),
+            'apikey': api_key
+        }
+    
+    if httpx is None:
+        # No async HTTP client installed: run the retrying requests session in threads
+        with make_session() as session:
+            async def get(batch):
+                async with semaphore:
+                    return await asyncio.to_thread(
+                        cached_get, session, ETHERSCAN_V2_URL, params(batch), max_age, 10
+                    )
+            
+            return await asyncio.gather(*(get(batch) for batch in batches))
+    
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=max_concurrency)) as http:
+        async def get(batch):
+            async with semaphore:
+                return await cached_get_async(http, ETHERSCAN_V2_URL, params(batch), max_age, timeout=10)
+        
+        return await asyncio.gather(*(get(batch) for batch in batches))
+
 def test_api_connection():
     """Test connection to Etherscan API"""
     print("\nTesting Etherscan API connection...")
     
-    import requests
-    import json
+    from json_io import load_config
     
     # Load API key from config.json
     try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-            api_key = config.get('etherscan_api_key', 'YourApiKeyToken')
+        config = load_config()
+        api_key = config.get('etherscan_api_key', 'YourApiKeyToken')
     except:
         api_key = 'YourApiKeyToken'
     
-    # Test with a known contract (CryptoPunks)
-    test_address = '0xb47e3cd837dDF8e4c57F05d70Ab865de6e193BBB'
-    
-    params = {
-        'module': 'contract',
-        'action': 'getcontractcreation',
-        'contractaddresses': test_address,
-        'apikey': api_key
-    }
+    # Test with known contracts (CryptoPunks, BAYC, CryptoKitties); getcontractcreation
+    # takes up to 5 comma-separated addresses, so they all go in one request
+    test_addresses = [
+        '0xb47e3cd837dDF8e4c57F05d70Ab865de6e193BBB',
+        '0xBC4CA0EdA7647A8aB7C2061c2E118A18a936f13D',
+        '0x06012c8cf97BEaD5deAe237070F9587f8E7A266d',
+    ]
     
     try:
-        response = requests.get('https://api.etherscan.io/api', params=params, timeout=10)
-        data = response.json()
+        # Same async path an extractor would use for many batches, throttled with the
+        # limiter EtherscanClient uses. This checks the key and the network, so it
+        # never answers from the cache
+        data, = asyncio.run(fetch_creations([test_addresses], api_key, max_age=0))
         
         if data.get('status') == '1':
             print("  ✓ API connection successful")
-            print(f"  Test contract: {test_address}")
-            if data.get('result'):
-                creator = data['result'][0]['contractCreator']
-                print(f"  Creator found: {creator}")
+            for creation in data.get('result') or []:
+                print(f"  Creator of {creation['contractAddress']}: {creation['contractCreator']}")
             return True
         else:
             error_msg = data.get('message', 'Unknown error')
@@ -117,6 +164,13 @@ def test_api_connection():
         print(f"  ✗ Connection error: {e}")
         return False
 
+TESTS = {
+    'imports': test_imports,
+    'api_key': test_api_key,
+    'contracts': test_contracts_file,
+    'connection': test_api_connection,
+}
+
 def main():
     """Run all tests"""
     print("=" * 80)
@@ -124,12 +178,7 @@ def main():
     print("=" * 80)
     print()
     
-    results = {
-        'imports': test_imports(),
-        'api_key': test_api_key(),
-        'contracts': test_contracts_file(),
-        'connection': test_api_connection(),
-    }
+    results = {name: test() for name, test in TESTS.items()}
     
     print("\n" + "=" * 80)
     print("TEST RESULTS")